@@ -1,22 +1,130 @@
 """
 Arduino Serial Communication Module
 Handles real-time data exchange with Arduino
+
+Concurrency model: the serial port is owned by a dedicated reader
+process (see _serial_reader_proc) so raw I/O never shares the GIL with
+the Flet UI or the ML models; a drain thread in the main process
+dispatches complete lines to the registered callbacks. An asyncio /
+pyserial-asyncio design was considered instead, but it would move the
+reads back onto the UI event loop (reintroducing GIL contention with
+inference) and add a dependency, so the process + queue split is kept.
 """
 
+import re
+import sys
 import serial
 import threading
+import multiprocessing
+import queue
 import time
 from typing import Callable, Optional, Dict, Any
 from datetime import datetime
+from collections import OrderedDict
+
+# Precompiled feedback pattern, matched against the raw bytes line so the
+# hot path never pays for decode/split/allocation churn; the even hotter
+# "T:..,H:.." packets are scanned by index in _parse_th instead
+_FB_RE = re.compile(rb'^USER_FEEDBACK:(-?\d+(?:\.\d+)?),(-?\d+(?:\.\d+)?),(\w+)$')
+
+def _serial_reader_proc(port: str, baud_rate: int, out_q, cmd_q):
+    """Serial reader process entry point.
+
+    Owns the serial port in a separate process so raw I/O never contends
+    with the UI and ML threads for the GIL. Complete lines are pushed to
+    out_q as ('line', bytes); outgoing messages arrive on cmd_q
+    (None is the shutdown sentinel).
+    """
+    try:
+        # Long blocking timeout: the OS wakes us on the first byte instead of
+        # a fast poll cycle; 0.5s (not None) so shutdown and outgoing writes
+        # are still serviced on an idle line
+        connection = serial.Serial(port, baud_rate, timeout=0.5)
+    except Exception as e:
+        out_q.put(('error', f"Connection failed: {e}"))
+        return
+
+    # Enlarge the OS receive buffer on Windows (default is only 4 KB) so a
+    # stalled consumer does not drop bytes under bursty input
+    if sys.platform.startswith('win'):
+        try:
+            connection.set_buffer_size(rx_size=65536, tx_size=8192)
+        except Exception:
+            pass
+
+    # Wait for Arduino reset
+    time.sleep(2)
+    out_q.put(('connected', port))
+
+    rx_buf = bytearray()
+
+    try:
+        while True:
+            # Coalesce all pending outgoing messages into one write + flush
+            pending = []
+            try:
+                while True:
+                    message = cmd_q.get_nowait()
+                    if message is None:
+                        return
+                    pending.append(message)
+            except queue.Empty:
+                pass
+            if pending:
+                connection.write(b''.join(pending))
+                connection.flush()
+
+            # Block on the kernel for the first byte (serial timeout bounds
+            # the wait), then drain everything else already buffered so a
+            # burst of lines costs a single read instead of one per line.
+            # Note: blocking here holds only this process's GIL - the UI
+            # and ML threads live in the parent process and are unaffected,
+            # so no C-level GIL-releasing read shim is needed
+            chunk = connection.read(1)
+            if not chunk:
+                continue
+
+            rx_buf += chunk
+            waiting = connection.in_waiting
+            if waiting > 0:
+                rx_buf += connection.read(waiting)
+
+            # Slice complete lines out of the reused buffer in place; the
+            # memoryview avoids an intermediate bytearray copy per line and
+            # the trailing partial line simply stays buffered
+            idx = rx_buf.find(b'\n')
+            while idx >= 0:
+                line = bytes(memoryview(rx_buf)[:idx])
+                del rx_buf[:idx + 1]
+                out_q.put(('line', line))
+                idx = rx_buf.find(b'\n')
+
+    except serial.SerialException as e:
+        out_q.put(('error', f"Serial communication error: {e}"))
+    except Exception as e:
+        out_q.put(('error', f"Data processing error: {e}"))
+    finally:
+        try:
+            connection.close()
+        except Exception:
+            pass
 
 class ArduinoSerial:
     """Arduino serial communication class"""
-    
+
+    # Dedup window for repeated status/action lines
+    _RECENT_CAPACITY = 64
+    _RECENT_TTL = 2.0  # seconds
+
+    # Dedup window for repeated user-feedback triples (a held button can
+    # spam identical events, each of which costs a model update downstream)
+    _FB_CAPACITY = 128
+    _FB_TTL = 1.0  # seconds
+
     def __init__(self, port: str = 'COM3', baud_rate: int = 9600, timeout: int = 1):
         self.port = port
         self.baud_rate = baud_rate
         self.timeout = timeout
-        self.serial_connection: Optional[serial.Serial] = None
         self.is_connected = False
         self.is_running = False
         
@@ -29,23 +137,43 @@ class ArduinoSerial:
         # Data cache
         self.last_data = {
             'temperature': 0.0,
-            'humidity': 0.0
+            'humidity': 0.0,
+            'timestamp': None
         }
         
         # Track last sent prediction to avoid duplicate logging
         self.last_sent_prediction = None
         
-        # Track last received status/action to avoid duplicate logging
-        self.last_received_status = None
-        self.last_received_action = None
+        # Recently logged status/action lines (bounded LRU with a short TTL),
+        # so alternating messages don't defeat deduplication
+        self._recent_lines = OrderedDict()
+
+        # Recently seen feedback triples, same LRU + TTL scheme
+        self._fb_seen = OrderedDict()
         
-        # Statistics
+        # Statistics (lock-guarded so counters stay correct on
+        # free-threaded builds where += is not GIL-atomic)
+        self._stats_lock = threading.Lock()
         self.packets_received = 0
         self.packets_sent = 0
         self.connection_time = None
         
-        # Threading
-        self.serial_thread: Optional[threading.Thread] = None
+        # Reader process and its queues
+        self.reader_process: Optional[multiprocessing.Process] = None
+        self.out_queue: Optional[multiprocessing.Queue] = None
+        self.cmd_queue: Optional[multiprocessing.Queue] = None
+        
+        # Drain thread dispatching lines from the reader process
+        self.drain_thread: Optional[threading.Thread] = None
+
+        # Per-line dispatch keyed on the first byte; handlers fall back to
+        # _parse_other when the rest of the line does not match
+        self._dispatch = {
+            b'T': self._parse_th,
+            b'U': self._parse_fb,
+            b'S': self._parse_status,
+            b'A': self._parse_action,
+        }
     
     def set_callbacks(self, 
                      data_callback: Callable = None,
@@ -59,45 +187,61 @@ class ArduinoSerial:
         self.feedback_callback = feedback_callback
     
     def connect(self) -> bool:
-        """Connect to Arduino"""
+        """Connect to Arduino (spawns the reader process)"""
+        # Reopening the port resets the Arduino and wipes its device
+        # state, so the send-on-change dedup must start over
+        self.last_sent_prediction = None
         try:
-            self.serial_connection = serial.Serial(
-                self.port, 
-                self.baud_rate, 
-                timeout=self.timeout
+            self.out_queue = multiprocessing.Queue()
+            self.cmd_queue = multiprocessing.Queue()
+            self.reader_process = multiprocessing.Process(
+                target=_serial_reader_proc,
+                args=(self.port, self.baud_rate, self.out_queue, self.cmd_queue),
+                daemon=True
             )
+            self.reader_process.start()
             
-            # Wait for Arduino reset
-            time.sleep(2)
-            
-            self.is_connected = True
-            self.connection_time = datetime.now()
-            
-            if self.status_callback:
-                self.status_callback(f"Connected to Arduino: {self.port}")
-            
-            return True
+            # Wait for the reader process to open the port (covers Arduino reset)
+            kind, payload = self.out_queue.get(timeout=10)
             
-        except serial.SerialException as e:
+        except queue.Empty:
             self.is_connected = False
             if self.error_callback:
-                self.error_callback(f"Connection failed: {e}")
+                self.error_callback("Connection failed: no response from reader process")
             return False
         except Exception as e:
             self.is_connected = False
             if self.error_callback:
                 self.error_callback(f"Unknown error: {e}")
             return False
+        
+        if kind == 'error':
+            self.is_connected = False
+            if self.error_callback:
+                self.error_callback(payload)
+            return False
+        
+        self.is_connected = True
+        self.connection_time = datetime.now()
+        
+        if self.status_callback:
+            self.status_callback(f"Connected to Arduino: {self.port}")
+        
+        return True
     
     def disconnect(self):
         """Disconnect Arduino connection"""
         self.is_running = False
         
-        if self.serial_thread and self.serial_thread.is_alive():
-            self.serial_thread.join(timeout=2)
+        if self.reader_process and self.reader_process.is_alive():
+            # Shutdown sentinel; fall back to terminate if the process hangs
+            self.cmd_queue.put(None)
+            self.reader_process.join(timeout=2)
+            if self.reader_process.is_alive():
+                self.reader_process.terminate()
         
-        if self.serial_connection and self.serial_connection.is_open:
-            self.serial_connection.close()
+        if self.drain_thread and self.drain_thread.is_alive():
+            self.drain_thread.join(timeout=2)
             
         self.is_connected = False
         
@@ -105,126 +249,169 @@ class ArduinoSerial:
             self.status_callback("Arduino connection disconnected")
     
     def start_communication(self):
-        """Start serial communication thread"""
+        """Start dispatching data from the reader process"""
         if not self.is_connected:
             if not self.connect():
                 return False
         
         self.is_running = True
-        self.serial_thread = threading.Thread(target=self._communication_loop, daemon=True)
-        self.serial_thread.start()
+        self.drain_thread = threading.Thread(target=self._drain_loop, daemon=True)
+        self.drain_thread.start()
         
         if self.status_callback:
             self.status_callback("Starting real-time data reception")
         
         return True
     
-    def _communication_loop(self):
-        """Serial communication main loop"""
+    def _drain_loop(self):
+        """Dispatch lines from the reader process to the callbacks"""
         while self.is_running and self.is_connected:
             try:
-                if self.serial_connection.in_waiting > 0:
-                    # Read Arduino data
-                    line = self.serial_connection.readline().decode('utf-8').strip()
-                    
-                    if line:
-                        self._process_arduino_data(line)
-                        
-                time.sleep(0.05)  # 50ms interval
-                
-            except serial.SerialException as e:
+                kind, payload = self.out_queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            
+            if kind == 'line':
+                raw_line = payload.strip()
+                if raw_line:
+                    self._process_arduino_data(raw_line)
+            elif kind == 'error':
                 if self.error_callback:
-                    self.error_callback(f"Serial communication error: {e}")
+                    self.error_callback(payload)
                 self.is_connected = False
                 break
-            except Exception as e:
-                if self.error_callback:
-                    self.error_callback(f"Data processing error: {e}")
     
-    def _process_arduino_data(self, data_line: str):
-        """Process data received from Arduino"""
+    def _process_arduino_data(self, raw_line: bytes):
+        """Process a raw bytes line received from Arduino"""
         try:
-            # Expected data format: "T:25.6,H:45.2" (removed target temperature)
-            if data_line.startswith("T:") and ",H:" in data_line:
-                parts = data_line.split(',')
-                
-                # Parse temperature
-                temp_str = parts[0].split(':')[1]
-                temperature = float(temp_str)
-                
-                # Parse humidity
-                hum_str = parts[1].split(':')[1]
-                humidity = float(hum_str)
-                
-                # Update cache (no target temperature needed)
-                self.last_data = {
-                    'temperature': temperature,
-                    'humidity': humidity,
-                    'timestamp': datetime.now()
-                }
-                
-                self.packets_received += 1
-                
-                # Call data callback
-                if self.data_callback:
-                    self.data_callback(self.last_data)
-            
-            elif data_line.startswith("USER_FEEDBACK:"):
-                # Handle user feedback data: "USER_FEEDBACK:25.6,45.2,hot"
-                feedback_data = data_line.replace("USER_FEEDBACK:", "")
-                parts = feedback_data.split(',')
-                
-                if len(parts) == 3:
-                    temperature = float(parts[0])
-                    humidity = float(parts[1])
-                    feeling = parts[2].strip()
-                    
-                    # Call feedback callback if available
-                    if hasattr(self, 'feedback_callback') and self.feedback_callback:
-                        self.feedback_callback(temperature, humidity, feeling)
-                        
-            elif data_line.startswith("Status:") or data_line.startswith("Action:"):
-                # Process status information - only log if changed
-                if data_line.startswith("Status:"):
-                    if data_line != self.last_received_status:
-                        if self.status_callback:
-                            self.status_callback(data_line)
-                        self.last_received_status = data_line
-                elif data_line.startswith("Action:"):
-                    if data_line != self.last_received_action:
-                        if self.status_callback:
-                            self.status_callback(data_line)
-                        self.last_received_action = data_line
-                    
+            handler = self._dispatch.get(raw_line[:1])
+            if handler:
+                handler(raw_line)
             else:
-                # Other information - filter out redundant messages
-                if "Received command from Python" not in data_line:
-                    if self.status_callback:
-                        self.status_callback(f"Arduino: {data_line}")
-                    
+                self._parse_other(raw_line)
         except (ValueError, IndexError) as e:
             if self.error_callback:
-                self.error_callback(f"Data parsing error: {e}, Raw data: {data_line}")
+                self.error_callback(f"Data parsing error: {e}, Raw data: {raw_line!r}")
+
+    def _parse_th(self, raw_line: bytes):
+        """Numeric fast path - expected format: "T:25.6,H:45.2",
+        scanned by index straight from bytes (no splits, no regex)"""
+        try:
+            comma = raw_line.index(b',H:', 2)
+            temperature = float(raw_line[2:comma])
+            humidity = float(raw_line[comma + 3:])
+        except ValueError:
+            # Not a sensor packet (e.g. a free-form "T..." message)
+            self._parse_other(raw_line)
+            return
+
+        # Update cache in place (no per-packet dict allocation); the raw
+        # time.time() float is converted to datetime only when a consumer
+        # actually asks for it in get_connection_info
+        last_data = self.last_data
+        last_data['temperature'] = temperature
+        last_data['humidity'] = humidity
+        last_data['timestamp'] = time.time()
+
+        with self._stats_lock:
+            self.packets_received += 1
+
+        # Snapshot the callback so concurrent re-registration can't race
+        data_callback = self.data_callback
+        if data_callback is not None:
+            data_callback(last_data)
+
+    def _parse_fb(self, raw_line: bytes):
+        """Handle user feedback data: "USER_FEEDBACK:25.6,45.2,hot\""""
+        m = _FB_RE.match(raw_line)
+        if m is None:
+            self._parse_other(raw_line)
+            return
+
+        temperature = float(m.group(1))
+        humidity = float(m.group(2))
+        feeling = m.group(3).decode('ascii')
+
+        # Drop duplicate triples within the TTL window - each accepted
+        # event triggers CSV writes and UI rebuilds downstream
+        key = (round(temperature, 1), round(humidity, 1), feeling)
+        now = time.monotonic()
+        last_seen = self._fb_seen.get(key)
+        self._fb_seen[key] = now
+        self._fb_seen.move_to_end(key)
+        if len(self._fb_seen) > self._FB_CAPACITY:
+            self._fb_seen.popitem(last=False)
+        if last_seen is not None and now - last_seen < self._FB_TTL:
+            return
+
+        # Call feedback callback if available (always set in __init__,
+        # so a plain None check on the snapshot suffices)
+        feedback_callback = self.feedback_callback
+        if feedback_callback is not None:
+            feedback_callback(temperature, humidity, feeling)
+
+    def _should_log(self, line: str) -> bool:
+        """Check whether a status/action line was logged within the TTL window"""
+        now = time.monotonic()
+        last_seen = self._recent_lines.get(line)
+
+        self._recent_lines[line] = now
+        self._recent_lines.move_to_end(line)
+        if len(self._recent_lines) > self._RECENT_CAPACITY:
+            self._recent_lines.popitem(last=False)
+
+        return last_seen is None or now - last_seen >= self._RECENT_TTL
+
+    def _parse_status(self, raw_line: bytes):
+        """Handle "Status:..." lines - deduplicated logging"""
+        if not raw_line.startswith(b'Status:'):
+            self._parse_other(raw_line)
+            return
+
+        data_line = raw_line.decode('utf-8', 'replace')
+        if self._should_log(data_line):
+            if self.status_callback:
+                self.status_callback(data_line)
+
+    def _parse_action(self, raw_line: bytes):
+        """Handle "Action:..." lines - deduplicated logging"""
+        if not raw_line.startswith(b'Action:'):
+            self._parse_other(raw_line)
+            return
+
+        data_line = raw_line.decode('utf-8', 'replace')
+        if self._should_log(data_line):
+            if self.status_callback:
+                self.status_callback(data_line)
+
+    def _parse_other(self, raw_line: bytes):
+        """Other information - filter out redundant messages"""
+        data_line = raw_line.decode('utf-8', 'replace')
+        if "Received command from Python" not in data_line:
+            if self.status_callback:
+                self.status_callback(f"Arduino: {data_line}")
     
     def send_prediction(self, prediction: str) -> bool:
         """Send prediction result to Arduino"""
-        if not self.is_connected or not self.serial_connection:
+        if not self.is_connected or not self.cmd_queue:
             return False
-        
+
+        # Skip redundant sends - Arduino only needs state changes
+        if prediction == self.last_sent_prediction:
+            return True
+
         try:
-            # Send prediction result
+            # Hand the message to the reader process for writing
             message = f"{prediction}\n"
-            self.serial_connection.write(message.encode('utf-8'))
-            self.serial_connection.flush()
-            
-            self.packets_sent += 1
-            
-            # Only log if prediction changed
-            if prediction != self.last_sent_prediction:
-                if self.status_callback:
-                    self.status_callback(f"Sent prediction: {prediction}")
-                self.last_sent_prediction = prediction
-            
+            self.cmd_queue.put(message.encode('utf-8'))
+
+            with self._stats_lock:
+                self.packets_sent += 1
+            self.last_sent_prediction = prediction
+
+            if self.status_callback:
+                self.status_callback(f"Sent prediction: {prediction}")
+
             return True
             
         except Exception as e:
@@ -234,6 +421,11 @@ class ArduinoSerial:
     
     def get_connection_info(self) -> Dict[str, Any]:
         """Get connection status information"""
+        last_data = self.last_data.copy() if self.last_data else None
+        if last_data and last_data.get('timestamp'):
+            # Materialize the wall-clock timestamp lazily, off the hot path
+            last_data['timestamp'] = datetime.fromtimestamp(last_data['timestamp'])
+
         return {
             "is_connected": self.is_connected,
             "port": self.port,
@@ -241,7 +433,7 @@ class ArduinoSerial:
             "packets_received": self.packets_received,
             "packets_sent": self.packets_sent,
             "connection_time": self.connection_time,
-            "last_data": self.last_data.copy() if self.last_data else None
+            "last_data": last_data
         }
     
     def test_connection(self) -> bool:
@@ -258,4 +450,4 @@ class ArduinoSerial:
         """List available serial ports"""
         import serial.tools.list_ports
         ports = serial.tools.list_ports.comports()
-        return [port.device for port in ports] 
\ No newline at end of file
+        return [port.device for port in ports] 
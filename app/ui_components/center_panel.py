@@ -1,8 +1,35 @@
 import flet as ft
+import itertools
 import threading
 import time
 
-class CenterPanel:
+from ui_components.flusher import DebouncedFlushMixin
+
+# Animation frame sequences (module-level tuples, cycled per device)
+_FAN_FRAMES = ("🌀", "💨", "🌪️", "💨")
+_HEAT_FRAMES = ("🔥", "🔆", "🌡️", "🔆")
+
+# Static lookup tables (shared by all panel instances)
+_PERSON_DESCRIPTIONS = {
+    "Normal Person": "Moderate temperature sensitivity.\nBalanced comfort preferences for\nmost environmental conditions.",
+    "Hot Person": "High sensitivity to heat.\nPrefers cooler environments and\nfeels hot at lower temperatures.",
+    "Cold Person": "High sensitivity to cold.\nPrefers warmer environments and\nfeels cold at higher temperatures."
+}
+
+_PERSON_EMOJIS = {
+    "Normal Person": "🌡️",
+    "Hot Person": "🔥",
+    "Cold Person": "🧊"
+}
+
+_COMFORT_COLORS = {
+    "hot": "#F44336",
+    "cold": "#2196F3",
+    "comfortable": "#4CAF50",
+    "-": "#757575"
+}
+
+class CenterPanel(DebouncedFlushMixin):
     def __init__(self):
         # Pretrained model selection
         self.selected_pretrained_model = "Normal Person"
@@ -37,8 +64,19 @@ class CenterPanel:
         # Device status tracking
         self.fan_status = False
         self.heater_status = False
-        self.fan_animation_running = False
-        self.heater_animation_running = False
+
+        # Shared animation thread (drives both fan and heater icons)
+        self._anim_stop = threading.Event()
+        self._anim_thread = None
+
+        # Debounced panel-scoped flushing (shared mixin scaffolding)
+        self._init_flusher()
+
+        # Last values written to the control tree; repeat calls with the
+        # same values return before touching any control
+        self._last_pred_tuple = None
+        self._last_decision_status = None
+        self._last_device_state = None
         
         # Device status UI elements
         self.fan_icon = ft.Text("🌀", size=32)
@@ -68,13 +106,23 @@ class CenterPanel:
         
         # Store reference to main app for callbacks
         self.main_app = None
-    
+
+        # Cached panel tree (built once, leaves mutated afterwards)
+        self._panel = None
+
     def set_main_app(self, main_app):
         """Set reference to main application for callbacks"""
         self.main_app = main_app
-    
+        self._start_flusher()
+
     def create_panel(self) -> ft.Container:
-        """Create and return the center panel container"""
+        """Return the center panel container (built once, then cached)"""
+        if self._panel is None:
+            self._panel = self._build_panel()
+        return self._panel
+
+    def _build_panel(self) -> ft.Container:
+        """Compose the full center panel widget tree"""
         return ft.Container(
             content=ft.Column([
                 # Pretrained Model Select section
@@ -327,6 +375,14 @@ class CenterPanel:
     
     def update_ml_predictions(self, predictions: dict):
         """Update ML prediction displays"""
+        pred_tuple = (predictions.get('linear_regression', 'N/A'),
+                      predictions.get('random_forest', 'N/A'),
+                      predictions.get('bayes_theorem', 'N/A'),
+                      predictions.get('mlp', 'N/A'))
+        if pred_tuple == self._last_pred_tuple:
+            return
+        self._last_pred_tuple = pred_tuple
+        
         self.lr_prediction_text.value = predictions.get('linear_regression', 'N/A').upper()
         self.lr_prediction_text.color = self.get_comfort_color(predictions.get('linear_regression', 'N/A'))
         
@@ -338,12 +394,19 @@ class CenterPanel:
         
         self.mlp_prediction_text.value = predictions.get('mlp', 'N/A').upper()
         self.mlp_prediction_text.color = self.get_comfort_color(predictions.get('mlp', 'N/A'))
+
+        self._mark_dirty()
     
     def update_final_decision(self, decision: str, status: str):
         """Update final decision and system status"""
+        if (decision, status) == self._last_decision_status:
+            return
+        self._last_decision_status = (decision, status)
         self.final_decision_text.value = decision.upper()
         self.final_decision_text.color = self.get_comfort_color(decision)
         self.action_text.value = status
+
+        self._mark_dirty()
     
     def update_device_status(self, final_decision: str):
         """Update device status based on decision"""
@@ -361,101 +424,79 @@ class CenterPanel:
     
     def update_device_animations(self):
         """Update device animations and colors"""
+        if (self.fan_status, self.heater_status) == self._last_device_state:
+            return
+        self._last_device_state = (self.fan_status, self.heater_status)
+        
         # Update fan
         if self.fan_status:
             self.fan_status_text.value = "ON"
             self.fan_status_text.color = "#FFFFFF"
             if self.fan_card_container:
                 self.fan_card_container.bgcolor = "#1565C0"
-            if not self.fan_animation_running:
-                self.fan_animation_running = True
-                self.start_fan_rotation()
         else:
             self.fan_status_text.value = "OFF"
             self.fan_status_text.color = "#888888"
             if self.fan_card_container:
                 self.fan_card_container.bgcolor = None
-            self.fan_animation_running = False
             self.fan_icon.value = "🌀"
-        
+
         # Update heater
         if self.heater_status:
             self.heater_status_text.value = "ON"
             self.heater_status_text.color = "#FFFFFF"
             if self.heater_card_container:
                 self.heater_card_container.bgcolor = "#FFB74D"
-            if not self.heater_animation_running:
-                self.heater_animation_running = True
-                self.start_heater_pulse()
         else:
             self.heater_status_text.value = "OFF"
             self.heater_status_text.color = "#888888"
             if self.heater_card_container:
                 self.heater_card_container.bgcolor = None
-            self.heater_animation_running = False
             self.heater_icon.value = "🔥"
-    
-    def start_fan_rotation(self):
-        """Start fan animation"""
-        fan_frames = ["🌀", "💨", "🌪️", "💨"]
-        frame_index = [0]
-        
-        def rotate_fan():
-            if self.fan_animation_running and self.fan_status:
-                self.fan_icon.value = fan_frames[frame_index[0]]
-                frame_index[0] = (frame_index[0] + 1) % len(fan_frames)
-                if self.main_app:
-                    self.main_app.page.update()
-                threading.Timer(0.3, rotate_fan).start()
-            else:
-                self.fan_animation_running = False
-        
-        rotate_fan()
-    
-    def start_heater_pulse(self):
-        """Start heater animation"""
-        heat_frames = ["🔥", "🔆", "🌡️", "🔆"]
-        frame_index = [0]
-        
-        def pulse_heater():
-            if self.heater_animation_running and self.heater_status:
-                self.heater_icon.value = heat_frames[frame_index[0]]
-                frame_index[0] = (frame_index[0] + 1) % len(heat_frames)
-                if self.main_app:
-                    self.main_app.page.update()
-                threading.Timer(0.6, pulse_heater).start()
-            else:
-                self.heater_animation_running = False
-        
-        pulse_heater()
+
+        # One shared daemon thread drives both animations; it exits on its
+        # own once both devices are off
+        if (self.fan_status or self.heater_status) and not (
+                self._anim_thread and self._anim_thread.is_alive()):
+            self._anim_thread = threading.Thread(target=self._anim_loop, daemon=True)
+            self._anim_thread.start()
+
+        self._mark_dirty()
+
+    def _anim_loop(self):
+        """Animation loop advancing fan (0.3s) and heater (0.6s) frames"""
+        fan_iter = itertools.cycle(_FAN_FRAMES)
+        heater_iter = itertools.cycle(_HEAT_FRAMES)
+        next_fan = next_heater = time.monotonic()
+
+        while not self._anim_stop.is_set() and (self.fan_status or self.heater_status):
+            now = time.monotonic()
+            dirty = False
+
+            if self.fan_status and now >= next_fan:
+                self.fan_icon.value = next(fan_iter)
+                next_fan = now + 0.3
+                dirty = True
+
+            if self.heater_status and now >= next_heater:
+                self.heater_icon.value = next(heater_iter)
+                next_heater = now + 0.6
+                dirty = True
+
+            # Frame changes go through the debounced flush loop
+            if dirty:
+                self._mark_dirty()
+
+            self._anim_stop.wait(0.1)
     
     def get_comfort_color(self, prediction: str) -> str:
         """Get color based on prediction"""
-        if prediction == "hot":
-            return "#F44336"
-        elif prediction == "cold":
-            return "#2196F3"
-        elif prediction == "comfortable":
-            return "#4CAF50"
-        elif prediction == "-":
-            return "#757575"
-        else:
-            return "#888888"
-    
+        return _COMFORT_COLORS.get(prediction, "#888888")
+
     def get_person_description(self, person_type: str) -> str:
         """Get description for different person types"""
-        descriptions = {
-            "Normal Person": "Moderate temperature sensitivity.\nBalanced comfort preferences for\nmost environmental conditions.",
-            "Hot Person": "High sensitivity to heat.\nPrefers cooler environments and\nfeels hot at lower temperatures.",
-            "Cold Person": "High sensitivity to cold.\nPrefers warmer environments and\nfeels cold at higher temperatures."
-        }
-        return descriptions.get(person_type, "Unknown person type")
+        return _PERSON_DESCRIPTIONS.get(person_type, "Unknown person type")
 
     def get_person_emoji(self, person_type: str) -> str:
         """Get emoji based on person type"""
-        emojis = {
-            "Normal Person": "🌡️",
-            "Hot Person": "🔥",
-            "Cold Person": "🧊"
-        }
-        return emojis.get(person_type, "❓") 
\ No newline at end of file
+        return _PERSON_EMOJIS.get(person_type, "❓")
\ No newline at end of file
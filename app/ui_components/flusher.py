@@ -0,0 +1,67 @@
+import threading
+import time
+from contextlib import contextmanager
+
+class DebouncedFlushMixin:
+    """Debounced UI flushing shared by the panels and the main app
+
+    Mutations call _mark_dirty() (or group themselves in batch_update());
+    a single daemon thread coalesces the marks into at most one update()
+    of the owner's subtree per tick, so a fast event stream can't flood
+    the websocket with diffs. Owners pick the subtree via _flush_target().
+    """
+
+    # One refresh per ~33ms caps the diff rate at roughly 30 fps
+    FLUSH_INTERVAL = 0.033
+
+    def _init_flusher(self):
+        """Set up the dirty flag and batching state (call from __init__)"""
+        self._dirty = threading.Event()
+        self._flush_thread = None
+        self._in_batch = False
+
+    def _start_flusher(self):
+        """Start the flush thread (idempotent; call once wiring is done)"""
+        if self._flush_thread is None:
+            self._flush_thread = threading.Thread(target=self._ui_flush_loop, daemon=True)
+            self._flush_thread.start()
+
+    def _flush_target(self):
+        """Control whose subtree the flusher refreshes (None skips)
+
+        Panels diff their own cached tree once built and fall back to the
+        whole page before that; the main app overrides this to always
+        return the page.
+        """
+        if self._panel is not None:
+            return self._panel
+        return self.main_app.page if self.main_app else None
+
+    def _mark_dirty(self):
+        """Request a (debounced) update"""
+        if not self._in_batch:
+            self._dirty.set()
+
+    @contextmanager
+    def batch_update(self):
+        """Suppress per-mutation dirty marks; request one flush at exit"""
+        self._in_batch = True
+        try:
+            yield
+        finally:
+            self._in_batch = False
+            self._dirty.set()
+
+    def _ui_flush_loop(self):
+        """Coalesce dirty marks into at most one update() per tick"""
+        while True:
+            self._dirty.wait()
+            time.sleep(self.FLUSH_INTERVAL)  # Let closely-spaced mutations pile up
+            self._dirty.clear()
+
+            target = self._flush_target()
+            if target is not None:
+                try:
+                    target.update()
+                except Exception as ui_error:
+                    print(f"UI update error in flush loop (non-critical): {ui_error}")
@@ -1,6 +1,18 @@
 import flet as ft
 
-class LeftPanel:
+from ui_components.flusher import DebouncedFlushMixin
+
+# Shared style constants (immutable kwargs reused across cards/panels)
+_HEADER_STYLE = dict(size=16, weight=ft.FontWeight.BOLD, color="#FFD700")
+_CARD_PADDING = 12
+
+class LeftPanel(DebouncedFlushMixin):
+    # Progress-bar scaling: 32°F to 104°F range (0°C to 40°C equivalent);
+    # multiply by the precomputed reciprocal instead of dividing per tick
+    _TEMP_MIN = 32.0
+    _TEMP_SCALE = 1.0 / 72.0
+    _HUM_SCALE = 1.0 / 100.0
+
     def __init__(self):
         # Initialize sensor data
         self.current_temp = 0.0
@@ -28,17 +40,34 @@ class LeftPanel:
         
         # Store reference to main app for callbacks
         self.main_app = None
-    
+
+        # Last-applied sensor tuple; identical ticks skip the UI writes
+        # (DHT sensors often repeat the same reading many ticks in a row)
+        self._last_sensor_state = None
+
+        # Cached panel tree (built once, leaves mutated afterwards)
+        self._panel = None
+
+        # Debounced panel-scoped flushing (shared mixin scaffolding)
+        self._init_flusher()
+
     def set_main_app(self, main_app):
         """Set reference to main application for callbacks"""
         self.main_app = main_app
-    
+        self._start_flusher()
+
     def create_panel(self) -> ft.Container:
-        """Create and return the left panel container"""
+        """Return the left panel container (built once, then cached)"""
+        if self._panel is None:
+            self._panel = self._build_panel()
+        return self._panel
+
+    def _build_panel(self) -> ft.Container:
+        """Compose the full left panel widget tree"""
         return ft.Container(
             content=ft.Column([
                 ft.Container(
-                    content=ft.Text("📊 Current Status", size=16, weight=ft.FontWeight.BOLD, color="#FFD700"),
+                    content=ft.Text("📊 Current Status", **_HEADER_STYLE),
                     alignment=ft.alignment.center,
                     margin=ft.margin.only(bottom=8)
                 ),
@@ -51,7 +80,7 @@ class LeftPanel:
                             self.temp_text,
                             self.temp_progress
                         ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
-                        padding=12,
+                        padding=_CARD_PADDING,
                         expand=True,
                         alignment=ft.alignment.top_center
                     ),
@@ -66,7 +95,7 @@ class LeftPanel:
                             self.humidity_text,
                             self.humidity_progress
                         ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
-                        padding=12,
+                        padding=_CARD_PADDING,
                         expand=True,
                         alignment=ft.alignment.top_center
                     ),
@@ -81,7 +110,7 @@ class LeftPanel:
                             self.arduino_status_text,
                             self.connection_button
                         ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
-                        padding=12,
+                        padding=_CARD_PADDING,
                         expand=True,
                         alignment=ft.alignment.top_center
                     ),
@@ -95,6 +124,11 @@ class LeftPanel:
     
     def update_sensor_data(self, temperature: float, humidity: float, has_error: bool = False, error_msg: str = ""):
         """Update sensor data and UI"""
+        state = (temperature, humidity, has_error, error_msg)
+        if state == self._last_sensor_state:
+            return
+        self._last_sensor_state = state
+
         self.current_temp = temperature
         self.current_humidity = humidity
         self.has_sensor_error = has_error
@@ -109,13 +143,13 @@ class LeftPanel:
             self.temp_progress.value = 0
             self.humidity_progress.value = 0
         else:
-            self.temp_text.value = f"{self.current_temp:.1f}°F"
+            self.temp_text.value = f"{temperature:.1f}°F"
             self.temp_text.color = "#FF6B6B"
-            self.humidity_text.value = f"{self.current_humidity:.1f}%"
+            self.humidity_text.value = f"{humidity:.1f}%"
             self.humidity_text.color = "#4ECDC4"
-            # Temperature progress bar: 32°F to 104°F range (0°C to 40°C equivalent)
-            self.temp_progress.value = min(max((self.current_temp - 32.0) / 72.0, 0.0), 1.0)
-            self.humidity_progress.value = self.current_humidity / 100.0
+            scaled = (temperature - self._TEMP_MIN) * self._TEMP_SCALE
+            self.temp_progress.value = 0.0 if scaled < 0.0 else (1.0 if scaled > 1.0 else scaled)
+            self.humidity_progress.value = humidity * self._HUM_SCALE
     
     def update_arduino_status(self, status: str, color: str):
         """Update Arduino connection status"""
@@ -1,30 +1,77 @@
 import flet as ft
 import csv
-import os
-import sys
+import functools
+import itertools
+import time
+from collections import deque
+import pandas as pd
 from datetime import datetime
 from pathlib import Path
 
-class RightPanel:
+from ui_components.flusher import DebouncedFlushMixin
+
+# Shared style constants (immutable kwargs reused across cards/panels)
+_HEADER_STYLE = dict(size=16, weight=ft.FontWeight.BOLD, color="#FFD700")
+
+@functools.lru_cache(maxsize=4)
+def _fmt_time(sec: int, fmt: str) -> str:
+    """Format a whole-second timestamp (cached so bursts of log/feedback
+    events within the same second share one strftime call)"""
+    return datetime.fromtimestamp(sec).strftime(fmt)
+
+class _FeedbackRow:
+    """Pooled feedback row holding direct references to its mutable leaves,
+    so displaying a new entry mutates text values instead of allocating a
+    fresh Container/Column/Row/Text tree"""
+
     def __init__(self):
-        # User feedback data storage
-        self.user_feedback_data = []
+        self.time_text = ft.Text("", size=10, color="#888888")
+        self.feeling_text = ft.Text("", size=12, weight=ft.FontWeight.BOLD)
+        self.metrics_text = ft.Text("", size=11, color="#CCCCCC")
+        self.container = ft.Container(
+            content=ft.Column([
+                ft.Row([
+                    self.time_text,
+                    self.feeling_text,
+                ], spacing=5),
+                self.metrics_text
+            ], spacing=2),
+            padding=ft.padding.all(5),
+            border_radius=3,
+            bgcolor="#3C4043",
+            margin=ft.margin.only(bottom=2)
+        )
+
+class RightPanel(DebouncedFlushMixin):
+    # CSV file path resolved once at class level (project root is two
+    # levels above app/ui_components/)
+    _CSV_PATH = Path(__file__).resolve().parents[2] / "ml_data" / "user_custom.csv"
+    _dir_ready = False
+
+    @classmethod
+    def _ensure_dir(cls):
+        """Create the ml_data directory once; later instances skip the syscalls"""
+        if not cls._dir_ready:
+            cls._CSV_PATH.parent.mkdir(parents=True, exist_ok=True)
+            cls._dir_ready = True
+
+    def __init__(self):
+        # User feedback data storage, kept columnar (one deque per field)
+        # instead of a list of per-entry dicts: less memory per entry,
+        # and maxlen gives O(1) eviction when the window is full
         self.max_feedback_entries = 50
-        
+        # Log display cap; once reached, the oldest control is recycled
+        # in place instead of allocating a new one per message
+        self.max_log_entries = 100
+        self._fb_ts = deque(maxlen=self.max_feedback_entries)
+        self._fb_temp = deque(maxlen=self.max_feedback_entries)
+        self._fb_hum = deque(maxlen=self.max_feedback_entries)
+        self._fb_feel = deque(maxlen=self.max_feedback_entries)
+
         # CSV file path settings
-        # Calculate project root directory path
-        if hasattr(sys, '_getframe'):
-            current_file = Path(__file__)
-            project_root = current_file.parent.parent.parent  # Go back to root directory from app/ui_components/
-        else:
-            # Fallback solution
-            project_root = Path.cwd()
-        
-        self.csv_file_path = project_root / "ml_data" / "user_custom.csv"
-        
-        # Ensure ml_data directory exists
-        self.csv_file_path.parent.mkdir(parents=True, exist_ok=True)
-        
+        self.csv_file_path = type(self)._CSV_PATH
+        self._ensure_dir()
+
         # Load historical user feedback data
         self.load_user_feedback_from_csv()
         
@@ -48,28 +95,60 @@ class RightPanel:
         
         # Store reference to main app for callbacks
         self.main_app = None
-        
+
         # Initialize UI display (needs to be called again after set_main_app for correct updates)
         self.initial_ui_setup_needed = True
-    
+
+        # Debounced panel-scoped flushing (shared mixin scaffolding)
+        self._init_flusher()
+
+        # Whether the feedback list currently shows the empty placeholder
+        self._showing_placeholder = False
+
+        # Appends since the CSV was last compacted to the bounded window
+        self._appends_since_compact = 0
+
+        # Pool of pre-built feedback rows, recycled round-robin so steady-
+        # state feedback display allocates no new controls
+        self._row_pool = [_FeedbackRow() for _ in range(20)]
+        self._pool_next = 0
+
+        # Cached panel tree (built once, leaves mutated afterwards)
+        self._panel = None
+
     def set_main_app(self, main_app):
         """Set reference to main application for callbacks"""
         self.main_app = main_app
-        
+        self._start_flusher()
+
         # If there's historical data and this is the initial setup, update UI display
-        if self.initial_ui_setup_needed and self.user_feedback_data:
+        if self.initial_ui_setup_needed and self._fb_ts:
             self.update_feedback_display()
             self.initial_ui_setup_needed = False
-    
+
+    @property
+    def user_feedback_data(self):
+        """Backward-compatible list-of-dicts view over the columnar storage"""
+        return [
+            {'timestamp': ts, 'temperature': temp, 'humidity': hum, 'feeling': feel}
+            for ts, temp, hum, feel in zip(self._fb_ts, self._fb_temp, self._fb_hum, self._fb_feel)
+        ]
+
     def create_panel(self) -> ft.Container:
-        """Create and return the right panel container"""
+        """Return the right panel container (built once, then cached)"""
+        if self._panel is None:
+            self._panel = self._build_panel()
+        return self._panel
+
+    def _build_panel(self) -> ft.Container:
+        """Compose the full right panel widget tree"""
         return ft.Container(
             content=ft.Column([
                 # User Feedback Data section
                 ft.Container(
                     content=ft.Column([
                         ft.Container(
-                            content=ft.Text("👤 User Feedback Data", size=16, weight=ft.FontWeight.BOLD, color="#FFD700"),
+                            content=ft.Text("👤 User Feedback Data", **_HEADER_STYLE),
                             alignment=ft.alignment.center,
                             margin=ft.margin.only(bottom=5),
                             height=25
@@ -97,7 +176,7 @@ class RightPanel:
                 ft.Container(
                     content=ft.Column([
                         ft.Container(
-                            content=ft.Text("📝 System Log", size=16, weight=ft.FontWeight.BOLD, color="#FFD700"),
+                            content=ft.Text("📝 System Log", **_HEADER_STYLE),
                             alignment=ft.alignment.center,
                             margin=ft.margin.only(bottom=5),
                             height=25
@@ -122,59 +201,83 @@ class RightPanel:
     
     def add_log_message(self, message: str, color: str = "#E0E0E0"):
         """Add a message to the system log"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_entry = ft.Container(
-            content=ft.Text(f"[{timestamp}] {message}", size=12, color=color),
-            padding=ft.padding.all(3),
-            border_radius=3,
-            margin=ft.margin.only(bottom=1)
-        )
+        timestamp = _fmt_time(int(time.time()), "%H:%M:%S")
+        controls = self.log_list.controls
         
-        self.log_list.controls.append(log_entry)
-        
-        # Keep only the last 100 log entries
-        if len(self.log_list.controls) > 100:
-            self.log_list.controls.pop(0)
+        if len(controls) >= self.max_log_entries:
+            # Ring behaviour at capacity: recycle the oldest entry's
+            # controls with the new text instead of allocating fresh ones,
+            # keeping both entry count and steady-state allocations fixed
+            log_entry = controls.pop(0)
+            log_text = log_entry.content
+            log_text.value = f"[{timestamp}] {message}"
+            log_text.color = color
+        else:
+            log_entry = ft.Container(
+                content=ft.Text(f"[{timestamp}] {message}", size=12, color=color),
+                padding=ft.padding.all(3),
+                border_radius=3,
+                margin=ft.margin.only(bottom=1)
+            )
         
-        if self.main_app and hasattr(self.main_app, 'page'):
-            self.main_app.page.update()
+        controls.append(log_entry)
+
+        self._mark_dirty()
     
     def add_user_feedback(self, temperature: float, humidity: float, feeling: str):
         """Add user feedback data entry"""
         # Use complete timestamp (including date)
-        full_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        display_timestamp = datetime.now().strftime("%H:%M:%S")
-        
-        # Create feedback entry
-        feedback_entry = {
-            'timestamp': full_timestamp,  # Save complete timestamp to CSV
-            'temperature': temperature,
-            'humidity': humidity,
-            'feeling': feeling
-        }
-        
-        # Add to data storage
-        self.user_feedback_data.append(feedback_entry)
-        
-        # Keep only the last max_feedback_entries
-        if len(self.user_feedback_data) > self.max_feedback_entries:
-            self.user_feedback_data.pop(0)
+        full_timestamp = _fmt_time(int(time.time()), "%Y-%m-%d %H:%M:%S")
         
+        # Add to columnar storage (complete timestamp is saved to CSV)
+        # maxlen evicts the oldest entry for us once the window is full
+        self._fb_ts.append(full_timestamp)
+        self._fb_temp.append(temperature)
+        self._fb_hum.append(humidity)
+        self._fb_feel.append(feeling)
+
         # Save to CSV file
         self.save_user_feedback_to_csv()
-        
-        # Update UI
-        self.update_feedback_display()
-        
+
+        # Incremental UI update: refill the next pooled row and move it to
+        # the bottom of the list (recycling the oldest once 20 are shown)
+        if self._showing_placeholder:
+            self.feedback_list.controls.clear()
+            self._showing_placeholder = False
+
+        row = self._row_pool[self._pool_next]
+        self._pool_next = (self._pool_next + 1) % len(self._row_pool)
+        self._fill_feedback_row(row, full_timestamp, temperature, humidity, feeling)
+
+        controls = self.feedback_list.controls
+        if row.container in controls:
+            controls.remove(row.container)
+        controls.append(row.container)
+
+        self._mark_dirty()
+
         # Log the feedback
         feeling_color = self.get_comfort_color(feeling)
         self.add_log_message(f"👤 User feedback: {feeling.upper()} (T:{temperature:.1f}°F, H:{humidity:.0f}%)", feeling_color)
-    
+
+    def _fill_feedback_row(self, row: _FeedbackRow, timestamp, temperature, humidity, feeling):
+        """Populate a pooled row's leaves with one feedback entry"""
+        # Extract display timestamp (show only time part)
+        timestamp = str(timestamp)
+        if len(timestamp) > 8:  # If it's a complete timestamp "YYYY-MM-DD HH:MM:SS"
+            display_time = timestamp.split(' ')[1]  # Take only time part
+        else:
+            display_time = timestamp  # If it's already in time format
+
+        row.time_text.value = f"[{display_time}]"
+        row.feeling_text.value = feeling.upper()
+        row.feeling_text.color = self.get_comfort_color(feeling)
+        row.metrics_text.value = f"T: {temperature:.1f}°F  |  H: {humidity:.0f}%"
+
     def update_feedback_display(self):
-        """Update the feedback list display"""
-        self.feedback_list.controls.clear()
-        
-        if not self.user_feedback_data:
+        """Rebuild the feedback list display (initial load / reset only;
+        steady-state additions go through the incremental path above)"""
+        if not self._fb_ts:
             # Show placeholder when no data
             placeholder = ft.Text(
                 "No user feedback data yet.\nPress buttons on board to add your feedback.",
@@ -182,41 +285,27 @@ class RightPanel:
                 color="#888888",
                 text_align=ft.TextAlign.CENTER
             )
-            self.feedback_list.controls.append(placeholder)
+            self.feedback_list.controls = [placeholder]
+            self._showing_placeholder = True
         else:
-            # Show recent feedback data (oldest first, newest at bottom)
-            for entry in self.user_feedback_data[-20:]:  # Show last 20 entries
-                feeling_color = self.get_comfort_color(entry['feeling'])
-                
-                # Extract display timestamp (show only time part)
-                timestamp = entry['timestamp']
-                if len(timestamp) > 8:  # If it's a complete timestamp "YYYY-MM-DD HH:MM:SS"
-                    display_time = timestamp.split(' ')[1]  # Take only time part
-                else:
-                    display_time = timestamp  # If it's already in time format
-                
-                # Create feedback entry display
-                feedback_row = ft.Container(
-                    content=ft.Column([
-                        ft.Row([
-                            ft.Text(f"[{display_time}]", size=10, color="#888888"),
-                            ft.Text(entry['feeling'].upper(), size=12, weight=ft.FontWeight.BOLD, color=feeling_color),
-                        ], spacing=5),
-                        ft.Text(
-                            f"T: {entry['temperature']:.1f}°F  |  H: {entry['humidity']:.0f}%",
-                            size=11,
-                            color="#CCCCCC"
-                        )
-                    ], spacing=2),
-                    padding=ft.padding.all(5),
-                    border_radius=3,
-                    bgcolor="#3C4043",
-                    margin=ft.margin.only(bottom=2)
-                )
-                self.feedback_list.controls.append(feedback_row)
-        
-        if self.main_app and hasattr(self.main_app, 'page'):
-            self.main_app.page.update()
+            # Show recent feedback data (oldest first, newest at bottom);
+            # islice walks the deques without allocating slice copies
+            total = len(self._fb_ts)
+            shown = min(total, 20)  # Show last 20 entries
+            start = total - shown
+            columns = zip(*(itertools.islice(col, start, total)
+                            for col in (self._fb_ts, self._fb_temp,
+                                        self._fb_hum, self._fb_feel)))
+            for row, (ts, temp, hum, feel) in zip(self._row_pool, columns):
+                self._fill_feedback_row(row, ts, temp, hum, feel)
+
+            self.feedback_list.controls = [
+                row.container for row in self._row_pool[:shown]
+            ]
+            self._pool_next = shown % len(self._row_pool)
+            self._showing_placeholder = False
+
+        self._mark_dirty()
     
     def get_comfort_color(self, prediction: str) -> str:
         """Get color based on prediction result"""
@@ -235,42 +324,54 @@ class RightPanel:
         """Load user feedback data from CSV file"""
         if self.csv_file_path.exists():
             try:
-                with open(self.csv_file_path, mode='r', newline='', encoding='utf-8') as file:
-                    reader = csv.DictReader(file)
-                    for row in reader:
-                        # Ensure correct data types
-                        feedback_entry = {
-                            'timestamp': row['timestamp'],
-                            'temperature': float(row['temperature']),
-                            'humidity': float(row['humidity']),
-                            'feeling': row['feeling']
-                        }
-                        self.user_feedback_data.append(feedback_entry)
-                
-                # Limit loaded data amount
-                if len(self.user_feedback_data) > self.max_feedback_entries:
-                    self.user_feedback_data = self.user_feedback_data[-self.max_feedback_entries:]
-                    
+                # C-level parse; tail() enforces the bounded window and
+                # to_dict('records') keeps the per-entry dict shape
+                # C-level parse; tail() enforces the bounded window and the
+                # columns drop straight into the columnar storage
+                df = pd.read_csv(self.csv_file_path).tail(self.max_feedback_entries)
+                self._fb_ts.extend(df['timestamp'].astype(str))
+                self._fb_temp.extend(df['temperature'].astype(float))
+                self._fb_hum.extend(df['humidity'].astype(float))
+                self._fb_feel.extend(df['feeling'].astype(str))
+
             except Exception as e:
                 print(f"Error loading user feedback from CSV: {e}")
-                self.user_feedback_data = []
-        else:
-            # If the file doesn't exist, create an empty list
-            self.user_feedback_data = []
     
     def save_user_feedback_to_csv(self):
-        """Save user feedback data to CSV file"""
+        """Persist the newest feedback entry (O(1) append per event)"""
         try:
-            with open(self.csv_file_path, mode='w', newline='', encoding='utf-8') as file:
+            # Periodically compact the file back down to the bounded window
+            # instead of rewriting everything on every single event
+            self._appends_since_compact += 1
+            if self._appends_since_compact >= 100:
+                self._rewrite_feedback_csv()
+                self._appends_since_compact = 0
+                return
+
+            write_header = not self.csv_file_path.exists()
+            with open(self.csv_file_path, mode='a', newline='', encoding='utf-8') as file:
                 fieldnames = ['timestamp', 'temperature', 'humidity', 'feeling']
                 writer = csv.DictWriter(file, fieldnames=fieldnames)
-                
-                # Write header
-                writer.writeheader()
-                
-                # Write all feedback data
-                for entry in self.user_feedback_data:
-                    writer.writerow(entry)
-                    
+
+                if write_header:
+                    writer.writeheader()
+
+                writer.writerow({
+                    'timestamp': self._fb_ts[-1],
+                    'temperature': self._fb_temp[-1],
+                    'humidity': self._fb_hum[-1],
+                    'feeling': self._fb_feel[-1],
+                })
+
         except Exception as e:
-            print(f"Error saving user feedback to CSV: {e}") 
\ No newline at end of file
+            print(f"Error saving user feedback to CSV: {e}")
+
+    def _rewrite_feedback_csv(self):
+        """Rewrite the CSV with just the in-memory feedback window"""
+        # Columnar storage serializes in one C-level to_csv call
+        pd.DataFrame({
+            'timestamp': self._fb_ts,
+            'temperature': list(self._fb_temp),
+            'humidity': list(self._fb_hum),
+            'feeling': self._fb_feel,
+        }).to_csv(self.csv_file_path, index=False) 
\ No newline at end of file
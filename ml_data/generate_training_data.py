@@ -1,17 +1,23 @@
-import os
-import csv
-import random
-import numpy as np
 from pathlib import Path
 
+# numpy/pandas are imported lazily inside the methods that need them, so
+# importing this module for its thresholds (or test_specific_case, which is
+# pure Python) doesn't pay their startup cost
+
 class TrainingDataGenerator:
     def __init__(self):
-        # Ensure data directory exists
-        self.data_dir = Path(".")  # Current directory (ml_data)
+        # Write next to this script (ml_data), not the caller's CWD, so
+        # running from the repo root doesn't scatter CSV copies there
+        self.data_dir = Path(__file__).resolve().parent
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
         # Dataset parameters
         self.num_samples = 500
+
+        # Single PCG64 generator for all sampling/noise (seeded for
+        # reproducible datasets)
+        import numpy as np
+        self.rng = np.random.default_rng(42)
         
         # Temperature range (Fahrenheit)
         self.temp_min = 32  # 0°C
@@ -23,33 +29,48 @@ class TrainingDataGenerator:
         
         # Comfort labels
         self.comfort_labels = ["cold", "comfortable", "hot"]
+
+        # Heat-index weight and (cold, comfortable) upper bounds per person
+        # type; mirrors the scalar get_*_person_comfort logic and drives the
+        # vectorized labeling in generate_dataset
+        self.person_params = {
+            "hot_person": (0.5, 60, 78),
+            "normal_person": (0.2, 65, 87),
+            "cold_person": (0.05, 78, 88),
+        }
     
     def generate_environmental_data(self):
-        """Generate temperature and humidity combination data"""
-        data_points = []
-        
+        """Generate temperature and humidity combinations as NumPy arrays"""
+        import numpy as np
+
         # Use grid sampling to ensure better coverage
         temp_steps = 25
         humidity_steps = 20
-        
+
         # Create grid points
-        temps = np.linspace(self.temp_min, self.temp_max, temp_steps)
-        humidities = np.linspace(self.humidity_min, self.humidity_max, humidity_steps)
-        
-        # Generate grid data points
-        for temp in temps:
-            for humidity in humidities:
-                data_points.append((round(temp, 1), round(humidity, 0)))
-        
+        temps = np.round(np.linspace(self.temp_min, self.temp_max, temp_steps), 1)
+        humidities = np.round(np.linspace(self.humidity_min, self.humidity_max, humidity_steps), 0)
+
+        # Full grid as two flat arrays
+        temp_grid, humidity_grid = np.meshgrid(temps, humidities, indexing='ij')
+        all_temps = temp_grid.ravel()
+        all_humidities = humidity_grid.ravel()
+
         # If grid points are not enough, add random points (should not happen with current settings)
-        while len(data_points) < self.num_samples:
-            temp = random.uniform(self.temp_min, self.temp_max)
-            humidity = random.uniform(self.humidity_min, self.humidity_max)
-            data_points.append((round(temp, 1), round(humidity, 0)))
-        
+        if all_temps.size < self.num_samples:
+            extra = self.num_samples - all_temps.size
+            all_temps = np.concatenate([
+                all_temps,
+                np.round(self.rng.uniform(self.temp_min, self.temp_max, extra), 1)
+            ])
+            all_humidities = np.concatenate([
+                all_humidities,
+                np.round(self.rng.uniform(self.humidity_min, self.humidity_max, extra), 0)
+            ])
+
         # Randomly select 500 points (or shuffle all if exactly 500 grid points)
-        random.shuffle(data_points)
-        return data_points[:self.num_samples]
+        selection = self.rng.permutation(all_temps.size)[:self.num_samples]
+        return all_temps[selection], all_humidities[selection]
     
     def get_hot_person_comfort(self, temperature, humidity):
         """Comfort judgment logic for heat-sensitive people"""
@@ -96,53 +117,73 @@ class TrainingDataGenerator:
     
     def add_noise_to_labels(self, labels, noise_ratio=0.05):
         """Add slight noise to labels to simulate real-world uncertainty"""
-        noisy_labels = []
-        for label in labels:
-            if random.random() < noise_ratio:
-                available_labels = [l for l in self.comfort_labels if l != label]
-                if available_labels: # Ensure there's a different label to choose
-                    noisy_label = random.choice(available_labels)
-                    noisy_labels.append(noisy_label)
-                else: # Should not happen with 3 labels
-                    noisy_labels.append(label) 
-            else:
-                noisy_labels.append(label)
-        return noisy_labels
+        import numpy as np
+
+        # Wide dtype so any label can be overwritten by a longer alternate
+        max_len = max(len(label) for label in self.comfort_labels)
+        labels_arr = np.asarray(labels, dtype=f'<U{max_len}')
+        n = labels_arr.size
+
+        # Two bulk draws decide which labels flip and which alternate is used
+        flip_mask = self.rng.random(n) < noise_ratio
+        alt_choice = self.rng.integers(0, 2, n)
+
+        for label in self.comfort_labels:
+            alternates = [l for l in self.comfort_labels if l != label]
+            flip_here = flip_mask & (labels_arr == label)
+            labels_arr[flip_here] = np.take(alternates, alt_choice[flip_here])
+
+        return labels_arr.tolist()
     
-    def generate_dataset(self, person_type):
-        """Generate dataset for specific person type"""
-        env_data = self.generate_environmental_data()
-        
-        if person_type == "hot_person":
-            comfort_func = self.get_hot_person_comfort
-        elif person_type == "normal_person":
-            comfort_func = self.get_normal_person_comfort
-        elif person_type == "cold_person":
-            comfort_func = self.get_cold_person_comfort
-        else:
+    def generate_dataset(self, person_type, env_data=None):
+        """Generate dataset for specific person type (vectorized labeling)
+
+        env_data: optional (temps, humidities) array pair so callers can
+        label the same environmental points for several person types
+        """
+        import numpy as np
+
+        if person_type not in self.person_params:
             raise ValueError(f"Unknown person type: {person_type}")
-        
-        labels = [comfort_func(temp, humidity) for temp, humidity in env_data]
-        labels = self.add_noise_to_labels(labels)
-        
-        dataset = [[temp, humidity, label] for (temp, humidity), label in zip(env_data, labels)]
+
+        if env_data is None:
+            env_data = self.generate_environmental_data()
+        temps, humidities = env_data
+        weight, cold_max, comfortable_max = self.person_params[person_type]
+
+        # One C-level pass over the arrays instead of 500 scalar comfort
+        # calls; digitize maps each heat index straight to a label bin
+        heat_index = temps + humidities * weight
+        bins = np.array([cold_max, comfortable_max])
+        labels_arr = np.array(self.comfort_labels)
+        idx = np.digitize(heat_index, bins)
+        labels = self.add_noise_to_labels(list(labels_arr[idx]))
+
+        dataset = [[float(temp), float(humidity), str(label)]
+                   for temp, humidity, label in zip(temps, humidities, labels)]
         return dataset
     
     def save_dataset(self, dataset, filename):
         """Save dataset to CSV file"""
+        import pandas as pd
+
         filepath = self.data_dir / filename
-        
-        with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(['temperature', 'humidity', 'comfort_label'])
-            writer.writerows(dataset)
-        
+
+        # C-level columnar serialization instead of per-row csv.writer calls
+        df = pd.DataFrame(dataset, columns=['temperature', 'humidity', 'comfort_label'])
+        df.to_csv(filepath, index=False)
+
         print(f"✅ Dataset saved to: {filepath}")
         return filepath
     
     def generate_all_datasets(self):
-        """Generate datasets for all three person types"""
-        datasets = {
+        """Generate datasets for all three person types
+
+        Returns the generated datasets keyed by person type so callers can
+        display/inspect them without regenerating (which would also consume
+        extra rng state)
+        """
+        filenames = {
             "hot_person": "hot_person_data.csv",
             "normal_person": "normal_person_data.csv", 
             "cold_person": "cold_person_data.csv"
@@ -154,41 +195,31 @@ class TrainingDataGenerator:
         print(f"💧 Humidity range: {self.humidity_min}% - {self.humidity_max}%")
         print("-" * 50)
         
-        for person_type, filename in datasets.items():
+        import numpy as np
+
+        # Generate the environmental grid once; every person type labels the
+        # same (temp, humidity) points, which also makes the three datasets
+        # directly comparable
+        env_data = self.generate_environmental_data()
+
+        results = {}
+        for person_type, filename in filenames.items():
             print(f"🔄 Generating {person_type} dataset...")
-            # Important: Reset random seed for each dataset generation if you want
-            # the *environmental data points* to be the same for each person type
-            # before shuffling and labeling.
-            # For this modification, we want the env_data to be the same for direct comparison of labels.
-            # However, generate_environmental_data shuffles internally.
-            # To ensure identical (temp, humidity) inputs before labeling for each person:
-            # Option 1: Generate env_data once outside the loop.
-            # Option 2: Re-seed before calling generate_environmental_data IF its internal
-            #           randomness needs to be reset for *this specific call only*.
-            # Current structure: generate_environmental_data is called for each person_type,
-            # so it will generate a *different set* of 500 shuffled (temp, humidity) points
-            # for each person type if random seeds are not carefully managed *inside* the loop.
-            # For distinct datasets, this is fine. For directly comparable labels on the *same*
-            # environmental points, env_data should be generated once.
-            # Let's stick to the original structure where each dataset gets its own random sample of points.
-            # If you set the global random.seed(42) once at the start, the sequence of
-            # random numbers is fixed, so generate_environmental_data() will produce the
-            # same sequence of points each time it's called IF it re-initializes its own random state or
-            # if the number of random calls before it is consistent.
-            # Given random.shuffle(data_points) is called, each person type will get a different set of points.
-
-            dataset = self.generate_dataset(person_type) # This now uses the new comfort logic
+            dataset = self.generate_dataset(person_type, env_data)
+            results[person_type] = dataset
             filepath = self.save_dataset(dataset, filename)
             
-            label_counts = {}
-            for row in dataset:
-                label = row[2]
-                label_counts[label] = label_counts.get(label, 0) + 1
+            counts = np.bincount(
+                np.searchsorted(self.comfort_labels, [row[2] for row in dataset]),
+                minlength=len(self.comfort_labels)
+            )
+            label_counts = dict(zip(self.comfort_labels, counts.tolist()))
             
             print(f"📈 Label distribution for {person_type}: {label_counts}")
             print()
         
         print("✅ All datasets generated successfully!")
+        return results
     
     def display_sample_data(self, dataset, person_type, num_samples=10):
         """Display dataset examples"""
@@ -215,29 +246,27 @@ class TrainingDataGenerator:
         print("-" * 50)
 
 if __name__ == "__main__":
-    # Set random seed for reproducible results for data point generation and noise
-    random.seed(42)
-    np.random.seed(42) # For numpy operations like linspace (though less critical for this problem)
-    
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate comfort training datasets")
+    parser.add_argument('--verbose', action='store_true',
+                        help="also run the threshold sanity check and print dataset samples")
+    args = parser.parse_args()
+
+    # Reproducibility comes from the generator's own seeded rng (PCG64)
     generator = TrainingDataGenerator()
     
-    # Test the specific case 74°F, 60% humidity with the new logic
-    generator.test_specific_case(74, 60)
+    if args.verbose:
+        # Test the specific case 74°F, 60% humidity with the new logic
+        generator.test_specific_case(74, 60)
     
-    generator.generate_all_datasets()
+    datasets = generator.generate_all_datasets()
     
-    # Display sample data for each dataset
-    # Note: display_sample_data will show data WITH noise.
-    # The generate_dataset call here will re-generate the data,
-    # potentially with different noise outcomes than what was saved if seeds aren't managed per call.
-    # To show samples from the *saved* files, you'd need to read the CSVs.
-    # For simplicity, we re-generate and show, keeping in mind noise is present.
-    print("\n--- Displaying samples from newly generated (in-memory) datasets ---")
-    person_types = ["hot_person", "normal_person", "cold_person"]
-    for person_type in person_types:
-        # Re-generate with the same seed logic if needed for consistent display
-        # However, random.seed(42) is set globally. The sequence of random numbers
-        # will continue. If generate_dataset is called multiple times, it will
-        # use subsequent random numbers for shuffling and noise.
-        dataset = generator.generate_dataset(person_type) 
-        generator.display_sample_data(dataset, person_type)
\ No newline at end of file
+    if args.verbose:
+        # Display sample data for each dataset
+        # Note: display_sample_data will show data WITH noise.
+        # Reusing the in-memory datasets means the samples shown are exactly
+        # what was saved to the CSVs (no second generation pass).
+        print("\n--- Displaying samples from the generated datasets ---")
+        for person_type, dataset in datasets.items():
+            generator.display_sample_data(dataset, person_type)
\ No newline at end of file
@@ -4,6 +4,19 @@ Base Model Class - Defines unified interface for all machine learning algorithms
 
 from abc import ABC, abstractmethod
 import numpy as np
+import sklearn
+
+# Every array reaching these models is generated in-process (CSV loads,
+# sensor values validated upstream in the app), so sklearn's per-call
+# finiteness checks in fit/predict are pure overhead. Trusted fast path:
+# inputs are assumed finite process-wide.
+sklearn.set_config(assume_finite=True)
+
+# The comfort label set is fixed, so the models share one hard-coded
+# encoding instead of each fitting a LabelEncoder (which re-sorts and
+# re-validates the same three strings on every train)
+LABEL_TO_INT = {'cold': 0, 'comfortable': 1, 'hot': 2}
+INT_TO_LABEL = np.array(['cold', 'comfortable', 'hot'])
 
 class BaseComfortModel(ABC):
     """Base class for comfort prediction models"""
@@ -26,7 +39,45 @@ class BaseComfortModel(ABC):
         """
         pass
     
-    @abstractmethod 
+    @staticmethod
+    def materialize_training_data(training_data) -> tuple:
+        """
+        Build (X, y) training arrays from a list of feedback-style records
+
+        Args:
+            training_data: sequence of dicts with 'temperature', 'humidity'
+                and 'comfort_label' keys (e.g. pandas to_dict('records')
+                output or the user-feedback entries)
+
+        Returns:
+            tuple: (X, y) where X is (n_samples, 2) float64 and y is the
+            label array, built with np.fromiter instead of per-row appends
+        """
+        n = len(training_data)
+        X = np.empty((n, 2), dtype=np.float64)
+        X[:, 0] = np.fromiter((d['temperature'] for d in training_data),
+                              dtype=np.float64, count=n)
+        X[:, 1] = np.fromiter((d['humidity'] for d in training_data),
+                              dtype=np.float64, count=n)
+        y = np.array([d['comfort_label'] for d in training_data])
+        return X, y
+
+    def predict_batch(self, X: np.ndarray) -> np.ndarray:
+        """
+        Predict comfort levels for many samples at once
+
+        Args:
+            X: Feature matrix of shape (n_samples, 2) containing [temperature, humidity]
+
+        Returns:
+            np.ndarray: comfort labels of shape (n_samples,)
+
+        Subclasses backed by vectorizable models should override this with a
+        single batched call; the default falls back to per-sample predict.
+        """
+        return np.array([self.predict(temp, hum) for temp, hum in X])
+
+    @abstractmethod
     def train(self, X: np.ndarray, y: np.ndarray):
         """
         Train model
@@ -37,4 +88,25 @@ class BaseComfortModel(ABC):
         """
         pass
     
-    
\ No newline at end of file
+    
+class SklearnComfortModel(BaseComfortModel):
+    """Shared scaffolding for the sklearn-backed models: estimator storage,
+    the fixed label encoding and the trained-state guard live here once.
+    Concrete subclasses keep only their estimator choice and their
+    specialized predict kernels."""
+
+    def __init__(self, model_name: str, estimator):
+        super().__init__(model_name)
+        self.model = estimator
+        self.feature_names = ['temperature', 'humidity']
+        self._classes_arr = INT_TO_LABEL
+
+    @staticmethod
+    def _encode_labels(y) -> np.ndarray:
+        """Encode comfort labels through the shared fixed mapping"""
+        return np.fromiter((LABEL_TO_INT[label] for label in y),
+                           dtype=np.int8, count=len(y))
+
+    def _require_trained(self):
+        if not self.is_trained:
+            raise ValueError("Model must be trained before making predictions")
@@ -3,20 +3,38 @@ Bayes' Theorem Algorithm - for comfort prediction
 Uses scikit-learn GaussianNB for implementation
 """
 
+import math
+
 import numpy as np
 from typing import Dict, Any, List
-from ..base_model import BaseComfortModel
+from ..base_model import SklearnComfortModel
 from sklearn.naive_bayes import GaussianNB
-from sklearn.preprocessing import LabelEncoder
 
-class BayesTheoremModel(BaseComfortModel):
+def _gnb_predict(t: float, h: float, params) -> int:
+    """Argmax of the Gaussian log-likelihood over the (fitted classes x 2
+    features) parameter rows; pure arithmetic with no sklearn dispatch"""
+    best_ll = -math.inf
+    best_class = 0
+    for class_idx, (mean_t, mean_h, var_t, var_h, log_det, log_prior) in enumerate(params):
+        dt = t - mean_t
+        dh = h - mean_h
+        ll = -0.5 * (dt * dt / var_t + dh * dh / var_h + log_det) + log_prior
+        if ll > best_ll:
+            best_ll = ll
+            best_class = class_idx
+    return best_class
+
+def _specialize_predict(params, classes):
+    """Bind the fitted Gaussian parameters into a scalar predict closure"""
+    def predict(temperature: float, humidity: float) -> str:
+        return classes[_gnb_predict(temperature, humidity, params)]
+    return predict
+
+class BayesTheoremModel(SklearnComfortModel):
     """Bayes' theorem comfort prediction model using scikit-learn"""
     
     def __init__(self):
-        super().__init__("Bayes' Theorem")
-        self.model = GaussianNB()
-        self.label_encoder = LabelEncoder()
-        self.feature_names = ['temperature', 'humidity']
+        super().__init__("Bayes' Theorem", GaussianNB())
     
     def predict(self, temperature: float, humidity: float) -> str:
         """
@@ -24,29 +42,51 @@ class BayesTheoremModel(BaseComfortModel):
         
         Calculate posterior probability for each class, choose the one with maximum probability
         """
-        if not self.is_trained:
-            raise ValueError("Model must be trained before making predictions")
-        
-        # Prepare input features
-        features = np.array([[temperature, humidity]])
-        
-        # Predict using trained model
-        prediction_encoded = self.model.predict(features)[0]
-        prediction = self.label_encoder.inverse_transform([prediction_encoded])[0]
-        
-        return prediction
-    
+        # train() rebinds this on the instance with a closure over the
+        # fitted Gaussian parameters; reaching the class method means
+        # the model is untrained
+        raise ValueError("Model must be trained before making predictions")
+
+    def predict_batch(self, X: np.ndarray) -> np.ndarray:
+        """Predict comfort levels for an (N, 2) feature matrix in one call"""
+        self._require_trained()
+
+        # One sklearn dispatch for the whole batch instead of N scalar calls
+        predictions_encoded = self.model.predict(X)
+        return self._classes_arr[predictions_encoded]
+
     def train(self, X: np.ndarray, y: np.ndarray):
         """
         Train Bayes model using scikit-learn
         
         Estimate prior probabilities and feature distribution parameters from training data
         """
-        # Encode labels
-        self.label_encoder.fit(['cold', 'comfortable', 'hot'])
-        y_encoded = self.label_encoder.transform(y)
+        # Encode labels via the shared fixed mapping
+        y_encoded = self._encode_labels(y)
         
+        # Train in float32: halves the data the sklearn kernels touch
+        X = np.ascontiguousarray(X, dtype=np.float32)
+
         # Train the model
         self.model.fit(X, y_encoded)
+
+        # Cache the fitted Gaussian parameters as plain floats, one row
+        # per class, for the scalar predict kernel
+        self._gnb_params = [
+            (
+                float(self.model.theta_[c, 0]), float(self.model.theta_[c, 1]),
+                float(self.model.var_[c, 0]), float(self.model.var_[c, 1]),
+                math.log(float(self.model.var_[c, 0]) * float(self.model.var_[c, 1])),
+                math.log(float(self.model.class_prior_[c])),
+            )
+            for c in range(len(self.model.classes_))
+        ]
+
+        # Decode through the classes sklearn actually fitted: if a label
+        # is absent from the training data, classes_ is a subset of the
+        # fixed mapping and the row index alone would name the wrong label
+        self.predict = _specialize_predict(self._gnb_params,
+                                           self._classes_arr[self.model.classes_])
+
         self.is_trained = True
        
\ No newline at end of file
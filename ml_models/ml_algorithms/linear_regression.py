@@ -5,50 +5,60 @@ Uses scikit-learn LinearRegression for implementation
 
 import numpy as np
 from typing import Dict, Any, List
-from ..base_model import BaseComfortModel
+from ..base_model import SklearnComfortModel
 from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import LabelEncoder
 
-class LinearRegressionModel(BaseComfortModel):
+def _specialize_predict(w0, w1, b, classes):
+    """Build a scalar predict closure with the fitted parameters bound as
+    cell variables, so the hot path runs without attribute lookups"""
+    def predict(temperature: float, humidity: float) -> str:
+        raw = w0 * temperature + w1 * humidity + b
+        return classes[max(0, min(2, int(round(raw))))]
+    return predict
+
+class LinearRegressionModel(SklearnComfortModel):
     """Linear regression comfort prediction model using scikit-learn"""
     
     def __init__(self):
-        super().__init__("Linear Regression")
-        self.model = LinearRegression()
-        self.label_encoder = LabelEncoder()
-        self.feature_names = ['temperature', 'humidity']
+        super().__init__("Linear Regression", LinearRegression())
     
     def predict(self, temperature: float, humidity: float) -> str:
-        """Use scikit-learn LinearRegression for prediction"""
-        if not self.is_trained:
-            raise ValueError("Model must be trained before making predictions")
-        
-        # Prepare input features
-        features = np.array([[temperature, humidity]])
-        
-        # Predict using trained model
-        prediction_encoded = self.model.predict(features)[0]
-        
-        # Convert prediction to nearest class
-        prediction_rounded = int(round(prediction_encoded))
-        
-        # Ensure prediction is within valid range
-        prediction_rounded = max(0, min(2, prediction_rounded))  # Clamp to valid range
-        
-        # Decode prediction
-        prediction = self.label_encoder.inverse_transform([prediction_rounded])[0]
-        
-        return prediction
-    
+        """Use scikit-learn LinearRegression for prediction
+
+        train() rebinds this on the instance with a closure specialized on
+        the fitted w·x + b; reaching the class method means untrained.
+        """
+        raise ValueError("Model must be trained before making predictions")
+
+    def predict_batch(self, X: np.ndarray) -> np.ndarray:
+        """Predict comfort levels for an (N, 2) feature matrix in one call"""
+        self._require_trained()
+
+        # One sklearn dispatch, then round/clamp the whole batch at once
+        predictions = self.model.predict(X)
+        predictions_rounded = np.clip(np.rint(predictions), 0, 2).astype(int)
+        return self._classes_arr[predictions_rounded]
+
     def train(self, X: np.ndarray, y: np.ndarray):
         """Train linear regression model using scikit-learn"""
         
-        # Encode labels to numbers
-        self.label_encoder.fit(['cold', 'comfortable', 'hot'])
-        y_encoded = self.label_encoder.transform(y)
+        # Encode labels via the shared fixed mapping
+        y_encoded = self._encode_labels(y)
         
+        # Train in float32 and column-major layout: the lstsq solver works
+        # feature-by-feature, so F-order streams each column contiguously
+        X = np.asfortranarray(X, dtype=np.float32)
+
         # Train the model
         self.model.fit(X, y_encoded)
+
+        # Specialize the scalar predict on the fitted coefficients
+        # (pure arithmetic, no attribute loads)
+        self._w0 = float(self.model.coef_[0])
+        self._w1 = float(self.model.coef_[1])
+        self._b = float(self.model.intercept_)
+        self.predict = _specialize_predict(self._w0, self._w1, self._b, self._classes_arr)
+
         self.is_trained = True
     
    
\ No newline at end of file
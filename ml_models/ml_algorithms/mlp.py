@@ -5,24 +5,51 @@ Uses scikit-learn MLPClassifier for implementation
 
 import numpy as np
 from typing import Dict, Any, List
-from ..base_model import BaseComfortModel
+from ..base_model import SklearnComfortModel
 from sklearn.neural_network import MLPClassifier
-from sklearn.preprocessing import LabelEncoder, StandardScaler
+from sklearn.preprocessing import StandardScaler
 
-class MLPModel(BaseComfortModel):
+def _mlp_forward(x, W0, b0, W1, b1, W2, b2) -> int:
+    """Forward pass for the 2->8->6->n_classes topology: three mat-vecs
+    with ReLU on the hidden layers, argmax over the output logits (softmax
+    is monotonic, so it can be skipped)"""
+    h0 = np.maximum(x @ W0 + b0, 0.0)
+    h1 = np.maximum(h0 @ W1 + b1, 0.0)
+    out = h1 @ W2 + b2
+    if out.shape[0] == 1:
+        # Binary fits get a single logistic unit; sigmoid(z) > 0.5 <=> z > 0
+        return 1 if out[0] > 0.0 else 0
+    return int(np.argmax(out))
+
+def _specialize_predict(inv_t, off_t, inv_h, off_h, layers, classes):
+    """Bind the scaling constants and layer weights into a scalar predict
+    closure feeding the forward kernel"""
+    W0, b0, W1, b1, W2, b2 = layers
+
+    def predict(temperature: float, humidity: float) -> str:
+        # Fresh input vector per call: the inference drain thread and the
+        # ground-truth feedback path both call this concurrently, and a
+        # shared buffer would interleave their writes
+        x = np.empty(2, dtype=np.float32)
+        x[0] = temperature * inv_t + off_t
+        x[1] = humidity * inv_h + off_h
+        return classes[_mlp_forward(x, W0, b0, W1, b1, W2, b2)]
+    return predict
+
+class MLPModel(SklearnComfortModel):
     """Multi-layer perceptron comfort prediction model using scikit-learn"""
     
     def __init__(self):
-        super().__init__("MLP (Neural Network)")
-        self.model = MLPClassifier(
+        super().__init__("MLP (Neural Network)", MLPClassifier(
             hidden_layer_sizes=(8, 6),  # Two hidden layers with 8 and 6 neurons
             activation='relu',          # ReLU activation function
             solver='adam',              # Adam optimizer
             learning_rate_init=0.01,    # Learning rate
             max_iter=500,               # Maximum iterations (increased to reduce convergence warnings)
             random_state=42             # For reproducible results
-        )
-        self.label_encoder = LabelEncoder()
+        ))
+        # Iteration budget when continuing from existing weights (see train)
+        self.retrain_max_iter = 100
         self.scaler = StandardScaler()  # For input normalization
         self.feature_names = ['temperature', 'humidity']
     
@@ -32,36 +59,78 @@ class MLPModel(BaseComfortModel):
         
         Forward propagation to get probabilities for each class, choose the class with highest probability
         """
-        if not self.is_trained:
-            # If not trained, use base prediction
-            raise ValueError("Model must be trained before making predictions")
-        
-        # Prepare and normalize input features
-        features = np.array([[temperature, humidity]])
-        features_scaled = self.scaler.transform(features)
-        
-        # Predict using trained model
-        prediction_encoded = self.model.predict(features_scaled)[0]
-        prediction = self.label_encoder.inverse_transform([prediction_encoded])[0]
-        
-        return prediction
-    
-    def train(self, X: np.ndarray, y: np.ndarray) -> None:
+        # train() rebinds this on the instance with a closure over the
+        # folded scaler constants and layer weights; reaching the class
+        # method means the model is untrained
+        raise ValueError("Model must be trained before making predictions")
+
+    def predict_batch(self, X: np.ndarray) -> np.ndarray:
+        """Predict comfort levels for an (N, 2) feature matrix in one call"""
+        self._require_trained()
+
+        # Normalize with the cached scaler parameters (one fused broadcast)
+        X_scaled = (X - self._mean) * self._inv_scale
+        predictions_encoded = self.model.predict(X_scaled)
+        return self._classes_arr[predictions_encoded]
+
+    def train(self, X: np.ndarray, y: np.ndarray, retrain: bool = False) -> None:
         """
         Train MLP model using scikit-learn
         
-        Uses backpropagation algorithm implemented in scikit-learn
+        Uses backpropagation algorithm implemented in scikit-learn.
+        With retrain=True a previously trained model warm-starts from its
+        existing weights and scaler statistics with a smaller iteration
+        budget — much cheaper when the data distribution shifted only a
+        little (fresh training data for the same person type).
         """
         if X.size == 0 or y.size == 0:
             raise ValueError("No training data provided")
         
-        # Encode labels
-        self.label_encoder.fit(['cold', 'comfortable', 'hot'])
-        y_encoded = self.label_encoder.transform(y)
+        # Encode labels via the shared fixed mapping
+        y_encoded = self._encode_labels(y)
         
-        # Normalize features
-        X_scaled = self.scaler.fit_transform(X)
+        # Train in float32 and column-major layout: the scaler and the
+        # fit kernels reduce per feature, so F-order streams each feature
+        # column contiguously
+        X = np.asfortranarray(X, dtype=np.float32)
+
+        warm = retrain and self.is_trained
+        self.model.warm_start = warm
+        self.model.max_iter = self.retrain_max_iter if warm else 500
+
+        # Normalize features (keep the fitted scaler stats when warm —
+        # re-fitting them would invalidate the reused weights)
+        if warm:
+            X_scaled = self.scaler.transform(X)
+        else:
+            X_scaled = self.scaler.fit_transform(X)
         
         # Train the model
         self.model.fit(X_scaled, y_encoded)
+
+        # Cache the scaler parameters folded into FMA form
+        # (x*inv_scale + offset) as plain floats, plus the batch arrays
+        self._mean = self.scaler.mean_.astype(np.float32)
+        self._inv_scale = (1.0 / self.scaler.scale_).astype(np.float32)
+        self._inv_t, self._inv_h = (float(v) for v in self._inv_scale)
+        self._off_t, self._off_h = (float(v) for v in -self._mean * self._inv_scale)
+
+        # Flatten the fitted layer weights/biases for the forward kernel
+        self._layers = (
+            self.model.coefs_[0].astype(np.float32),
+            self.model.intercepts_[0].astype(np.float32),
+            self.model.coefs_[1].astype(np.float32),
+            self.model.intercepts_[1].astype(np.float32),
+            self.model.coefs_[2].astype(np.float32),
+            self.model.intercepts_[2].astype(np.float32),
+        )
+
+        # Decode through the classes sklearn actually fitted: with a label
+        # missing from the training data the output layer is narrower and
+        # argmax indexes fitted-class order, not the fixed codes
+        self.predict = _specialize_predict(self._inv_t, self._off_t,
+                                           self._inv_h, self._off_h,
+                                           self._layers,
+                                           self._classes_arr[self.model.classes_])
+
         self.is_trained = True 
\ No newline at end of file
@@ -5,46 +5,129 @@ Uses scikit-learn RandomForestClassifier for implementation
 
 import numpy as np
 from typing import Dict, Any, List
-from ..base_model import BaseComfortModel
+from ..base_model import SklearnComfortModel
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import LabelEncoder
 
-class RandomForestModel(BaseComfortModel):
+def _rf_predict(t: float, h: float, forest) -> int:
+    """Walk every exported tree to a leaf and average the class
+    probabilities, mirroring RandomForestClassifier.predict without its
+    per-tree Python dispatch"""
+    v0 = v1 = v2 = 0.0
+    for feature, threshold, left, right, proba in forest:
+        node = 0
+        while left[node] != -1:
+            x = t if feature[node] == 0 else h
+            node = left[node] if x <= threshold[node] else right[node]
+        p = proba[node]
+        v0 += p[0]
+        v1 += p[1]
+        v2 += p[2]
+    if v0 >= v1 and v0 >= v2:
+        return 0
+    return 1 if v1 >= v2 else 2
+
+def _rf_predict_batch(X, forest_arrays, max_depth):
+    """Walk all samples through every tree level-by-level with array ops:
+    each depth step advances the whole batch's node ids at once, so the
+    Python-level work is O(trees * depth) instead of O(trees * samples)"""
+    n = X.shape[0]
+    votes = np.zeros((n, 3), dtype=np.float32)
+    t_col = np.ascontiguousarray(X[:, 0])
+    h_col = np.ascontiguousarray(X[:, 1])
+    for feature, threshold, left, right, proba in forest_arrays:
+        node = np.zeros(n, dtype=np.intp)
+        for _ in range(max_depth):
+            is_leaf = left[node] < 0
+            if is_leaf.all():
+                break
+            x = np.where(feature[node] == 0, t_col, h_col)
+            nxt = np.where(x <= threshold[node], left[node], right[node])
+            node = np.where(is_leaf, node, nxt)
+        votes += proba[node]
+    return votes.argmax(axis=1)
+
+def _specialize_predict(forest, classes):
+    """Bind the exported forest into a scalar predict closure"""
+    def predict(temperature: float, humidity: float) -> str:
+        return classes[_rf_predict(temperature, humidity, forest)]
+    return predict
+
+class RandomForestModel(SklearnComfortModel):
     """Random forest comfort prediction model using scikit-learn"""
     
     def __init__(self):
-        super().__init__("Random Forest")
-        self.model = RandomForestClassifier(
+        super().__init__("Random Forest", RandomForestClassifier(
             n_estimators=10,  # Number of trees
             random_state=42,  # For reproducible results
             max_depth=5,      # Prevent overfitting
-        )
-        self.label_encoder = LabelEncoder()
-        self.feature_names = ['temperature', 'humidity']
+            n_jobs=-1,        # Fit trees in parallel across cores
+        ))
     
     def predict(self, temperature: float, humidity: float) -> str:
         """Use scikit-learn RandomForestClassifier for prediction"""
-        if not self.is_trained:
-            raise ValueError("Model must be trained before making predictions")
-        
-        # Prepare input features
-        features = np.array([[temperature, humidity]])
-        
-        # Predict using trained model
-        prediction_encoded = self.model.predict(features)[0]
-        prediction = self.label_encoder.inverse_transform([prediction_encoded])[0]
-        
-        return prediction
-    
+        # train() rebinds this on the instance with a closure over the
+        # exported trees; reaching the class method means untrained
+        raise ValueError("Model must be trained before making predictions")
+
+    def predict_batch(self, X: np.ndarray) -> np.ndarray:
+        """Predict comfort levels for an (N, 2) feature matrix in one call"""
+        self._require_trained()
+
+        # Level-synchronous walk over the exported trees: no per-tree
+        # Python dispatch and no sklearn validation on the batch path
+        X = np.asarray(X, dtype=np.float64)
+        predictions_encoded = _rf_predict_batch(X, self._forest_arrays, self._max_depth)
+        return self._classes_arr[predictions_encoded]
+
     def train(self, X: np.ndarray, y: np.ndarray):
         """Train random forest model using scikit-learn"""
         if X.size == 0 or y.size == 0:
             raise ValueError("No training data provided")
         
-        # Encode labels
-        self.label_encoder.fit(['cold', 'comfortable', 'hot'])
-        y_encoded = self.label_encoder.transform(y)
+        # Encode labels via the shared fixed mapping
+        y_encoded = self._encode_labels(y)
         
+        # Train in float32: halves the data the sklearn kernels touch
+        X = np.ascontiguousarray(X, dtype=np.float32)
+
         # Train the model
         self.model.fit(X, y_encoded)
+
+        # Export each fitted tree to flat lists (split feature, threshold,
+        # children, leaf probabilities) for the scalar tree-walk kernel
+        self._forest = []
+        self._forest_arrays = []
+        self._max_depth = 0
+        for estimator in self.model.estimators_:
+            tree = estimator.tree_
+            counts = tree.value[:, 0, :]
+            proba = counts / counts.sum(axis=1, keepdims=True)
+            # Leaf rows are as wide as the classes sklearn fitted; if a
+            # label is absent from the training data, scatter them into
+            # full-width rows so vote columns line up with the fixed codes
+            if proba.shape[1] != len(self._classes_arr):
+                full = np.zeros((proba.shape[0], len(self._classes_arr)),
+                                dtype=proba.dtype)
+                full[:, self.model.classes_] = proba
+                proba = full
+            self._forest.append((
+                tree.feature.tolist(),
+                tree.threshold.tolist(),
+                tree.children_left.tolist(),
+                tree.children_right.tolist(),
+                proba.tolist(),
+            ))
+            # ndarray mirror of the same export for the batch walker;
+            # float32 probabilities halve what the vote loop streams
+            self._forest_arrays.append((
+                tree.feature.copy(),
+                tree.threshold.copy(),
+                tree.children_left.copy(),
+                tree.children_right.copy(),
+                proba.astype(np.float32),
+            ))
+            self._max_depth = max(self._max_depth, int(tree.max_depth))
+
+        self.predict = _specialize_predict(self._forest, self._classes_arr)
+
         self.is_trained = True
\ No newline at end of file
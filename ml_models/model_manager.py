@@ -1,16 +1,48 @@
+import functools
+import logging
+import logging.handlers
 import os
+import queue
 import pandas as pd
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from threadpoolctl import threadpool_limits
 import threading
 import time
 
+from .base_model import LABEL_TO_INT, INT_TO_LABEL
 from .ml_algorithms.linear_regression import LinearRegressionModel
 from .ml_algorithms.random_forest import RandomForestModel  
 from .ml_algorithms.bayes_theorem import BayesTheoremModel
 from .ml_algorithms.mlp import MLPModel
 from .our_model import OurModel
 
+# Telemetry goes through a queue drained by a background listener, so
+# emitting a message from the training/prediction threads is a lock-free
+# enqueue instead of synchronous stdout formatting and flushing
+_log_queue = queue.Queue(-1)
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler())
+_log_listener.start()
+log = logging.getLogger('ml_models')
+if not log.handlers:
+    log.addHandler(logging.handlers.QueueHandler(_log_queue))
+    log.setLevel(logging.INFO)
+
+@functools.lru_cache(maxsize=8)
+def load_training_arrays(path: str, mtime: float):
+    """Parse one training CSV into (X, y) arrays, cached on path + mtime
+
+    Person-type switches retrain from the same files repeatedly; keying the
+    cache on the file's mtime means edits to a CSV still invalidate it while
+    unchanged files cost a dict lookup instead of a pandas parse.
+    """
+    df = pd.read_csv(path,
+                     usecols=['temperature', 'humidity', 'comfort_label'],
+                     dtype={'temperature': 'float32', 'humidity': 'float32'},
+                     engine='c', memory_map=True)
+    return df[['temperature', 'humidity']].to_numpy(), df['comfort_label'].to_numpy()
+
 class ModelManager:
     def __init__(self):
         # Data path - calculate relative path from current file location to project root ml_data
@@ -42,15 +74,80 @@ class ModelManager:
         self.is_training = False
         self.training_progress = {}
         
+        # One persistent worker serializes training jobs: rapid person-type
+        # flicks queue instead of racing to overwrite self.models, queued
+        # jobs superseded before they start are cancelled, and a running
+        # job that got superseded skips publishing its result
+        self._train_exec = ThreadPoolExecutor(max_workers=1,
+                                              thread_name_prefix='ModelTrainer')
+        self._pending_future = None
+        self._train_generation = 0
+        
+        # Trained models kept per person type (keyed with the source CSV's
+        # mtime), so toggling back to a previously visited type reuses the
+        # fitted models instead of retraining from scratch
+        self._model_cache = {}
+
+        # Throttle for progress callbacks (monotonic-clock gated)
+        self._last_progress_ts = 0.0
+        
+        # Rolling per-model accuracy (EMA over user feedback), used to
+        # weight votes so a consistently wrong model stops cancelling out
+        # an accurate one
+        self._model_accuracy = {}
+        self._accuracy_ema_alpha = 0.1
+        
         # Callback functions
         self.on_training_complete = None
         self.on_training_progress = None
         
+        # Warm sklearn's lazily-built machinery off the critical path so
+        # the first real training is dominated by the actual fits
+        threading.Thread(target=self._prewarm, daemon=True).start()
+        
+    def _prewarm(self):
+        """Fit every model class once on a tiny synthetic dataset
+
+        The first fit of each estimator pays one-off costs (deferred
+        imports, validation setup, BLAS thread-pool spin-up) that would
+        otherwise land inside the user's first person-type switch.
+        """
+        X = np.array([[60, 40], [62, 45], [70, 50], [72, 55],
+                      [85, 60], [88, 65], [65, 42], [80, 58]],
+                     dtype=np.float32)
+        y = np.array(['cold', 'cold', 'comfortable', 'comfortable',
+                      'hot', 'hot', 'cold', 'hot'])
+        for model_class in self.model_classes.values():
+            try:
+                model_class().train(X, y)
+            except Exception:
+                # Prewarming is best-effort; real training reports errors
+                pass
+        
     def set_callbacks(self, training_complete_callback=None, training_progress_callback=None):
         """Set training callback functions"""
         self.on_training_complete = training_complete_callback
         self.on_training_progress = training_progress_callback
         
+    def _maybe_progress(self, msg: str, force: bool = False):
+        """Forward a progress message to the listener, rate-limited
+
+        Progress strings exist purely for the UI; with no listener this is
+        one attribute check, and with one it fires at most every 100 ms
+        (final/terminal messages pass force=True so they are never dropped).
+        """
+        if self.on_training_progress is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_progress_ts < 0.1:
+            return
+        self._last_progress_ts = now
+        try:
+            self.on_training_progress(msg)
+        except Exception as callback_error:
+            # If callback fails (usually due to threading), continue training
+            log.error("Training progress callback error: %s", callback_error)
+
     def load_person_data(self, person_type: str):
         """Load training data for specified person type"""
         if person_type not in self.person_data_files:
@@ -61,14 +158,8 @@ class ModelManager:
         if not data_file.exists():
             raise FileNotFoundError(f"Data file not found: {data_file}")
             
-        # Read CSV data
-        df = pd.read_csv(data_file)
-        
-        # Separate features and labels
-        X = df[['temperature', 'humidity']].values
-        y = df['comfort_label'].values
-        
-        return X, y
+        # Cached parse keyed on the file's current mtime
+        return load_training_arrays(str(data_file), data_file.stat().st_mtime)
     
     def switch_person_type(self, new_person_type: str):
         """Switch person type and retrain all models"""
@@ -80,124 +171,197 @@ class ModelManager:
             
         self.current_person_type = new_person_type
         
-        # Retrain models in background thread
-        training_thread = threading.Thread(
-            target=self._train_models_for_person_type,
-            args=(new_person_type,),
-            daemon=True
+        # Retrain models on the persistent training worker
+        self._submit_training(new_person_type)
+    
+    def _submit_training(self, person_type: str):
+        """Queue a training job, superseding any not-yet-finished one"""
+        self._train_generation += 1
+        if self._pending_future is not None and not self._pending_future.done():
+            # Drops the job if it has not started; a running job sees the
+            # bumped generation and skips publishing its models
+            self._pending_future.cancel()
+        self._pending_future = self._train_exec.submit(
+            self._train_models_for_person_type, person_type,
+            self._train_generation
         )
-        training_thread.start()
     
-    def _train_models_for_person_type(self, person_type: str):
+    def _train_models_for_person_type(self, person_type: str, generation: int = None):
         """Train all models for specified person type"""
+        if generation is None:
+            generation = self._train_generation
         self.is_training = True
         self.training_progress = {}
         
         try:
+            # Reuse cached models when this person type was trained before
+            # and its CSV has not changed since (mtime check)
+            data_file = self.data_dir / self.person_data_files.get(person_type, "")
+            data_mtime = data_file.stat().st_mtime if data_file.exists() else None
+            cached = self._model_cache.get(person_type)
+            if cached is not None and cached[0] == data_mtime:
+                self.models = cached[1]
+                self.training_progress = {name: "✓ Complete (cached)"
+                                          for name in self.models}
+                if self.on_training_complete:
+                    try:
+                        self.on_training_complete(person_type, len(self.models))
+                    except Exception as callback_error:
+                        log.error("Training complete callback error: %s", callback_error)
+                return
+            
             # Load data
-            if self.on_training_progress:
-                try:
-                    self.on_training_progress(f"Loading {person_type} data...")
-                except Exception as callback_error:
-                    print(f"Training progress callback error: {callback_error}")
+            self._maybe_progress(f"Loading {person_type} data...")
                 
             X, y = self.load_person_data(person_type)
             
-            # Train each model
+            # Train the five independent models in parallel; sklearn's fit
+            # kernels release the GIL, so threads overlap the heavy
+            # MLP/forest fits instead of paying their sum serially
             trained_models = {}
             total_models = len(self.model_classes)
-            
-            for i, (model_name, model_class) in enumerate(self.model_classes.items()):
-                if self.on_training_progress:
-                    try:
-                        self.on_training_progress(f"Training {model_name} for {person_type}... ({i+1}/{total_models})")
-                    except Exception as callback_error:
-                        # If callback fails (usually due to threading), continue training
-                        print(f"Training progress callback error: {callback_error}")
-                
-                try:
-                    # Create and train model
-                    model = model_class()
-                    
-                    # Train model directly with X, y arrays
+
+            def train_one(model_class):
+                model = model_class()
+                # Parallelism comes from the outer fan-out; pinning each
+                # fit to one BLAS thread stops five estimators from each
+                # spinning up a per-core pool and thrashing on context
+                # switches
+                with threadpool_limits(limits=1, user_api='blas'):
                     model.train(X, y)
-                    trained_models[model_name] = model
-                    
-                    self.training_progress[model_name] = "✓ Complete"
-                    
-                except Exception as e:
-                    print(f"Error training {model_name}: {e}")
-                    self.training_progress[model_name] = f"✗ Error: {str(e)}"
+                return model
+
+            self._maybe_progress(f"Training {total_models} models for {person_type} in parallel...")
+
+            # Cap the fan-out at the CPUs this process may actually use
+            # (containers often pin fewer cores than os.cpu_count reports);
+            # sched_getaffinity is Linux-only, so fall back to cpu_count
+            # on Windows/macOS
+            usable_cpus = (len(os.sched_getaffinity(0))
+                           if hasattr(os, "sched_getaffinity")
+                           else (os.cpu_count() or 1))
+            n_workers = min(total_models, usable_cpus)
+            with ThreadPoolExecutor(max_workers=n_workers) as executor:
+                futures = {
+                    model_name: executor.submit(train_one, model_class)
+                    for model_name, model_class in self.model_classes.items()
+                }
+
+                for model_name, future in futures.items():
+                    try:
+                        trained_models[model_name] = future.result()
+                        self.training_progress[model_name] = "✓ Complete"
+                    except Exception as e:
+                        log.error("Error training %s: %s", model_name, e)
+                        self.training_progress[model_name] = f"✗ Error: {str(e)}"
             
-            # Update model dictionary
+            # Remember the trained set for this person type until its CSV
+            # changes, but only publish it as active if no newer switch
+            # superseded this job while it trained
+            self._model_cache[person_type] = (data_mtime, trained_models)
+            if generation != self._train_generation:
+                return
             self.models = trained_models
             
-            if self.on_training_progress:
-                try:
-                    self.on_training_progress(f"Training complete for {person_type}!")
-                except Exception as callback_error:
-                    print(f"Training progress callback error: {callback_error}")
+            self._maybe_progress(f"Training complete for {person_type}!", force=True)
                 
             if self.on_training_complete:
                 try:
                     self.on_training_complete(person_type, len(trained_models))
                 except Exception as callback_error:
-                    print(f"Training complete callback error: {callback_error}")
+                    log.error("Training complete callback error: %s", callback_error)
                 
         except Exception as e:
-            print(f"Error during model training: {e}")
-            if self.on_training_progress:
-                try:
-                    self.on_training_progress(f"Training failed: {str(e)}")
-                except Exception as callback_error:
-                    print(f"Training progress callback error: {callback_error}")
+            log.error("Error during model training: %s", e)
+            self._maybe_progress(f"Training failed: {str(e)}", force=True)
         finally:
             self.is_training = False
     
-    def predict(self, temperature: float, humidity: float):
-        """Use currently trained models to make predictions"""
+    def predict(self, temperature: float, humidity: float, out: dict = None):
+        """Use currently trained models to make predictions
+
+        With out= the caller's dict is filled in place, so per-frame
+        callers can reuse one predictions dict instead of allocating a
+        fresh one per sensor reading.
+        """
+        predictions = out if out is not None else {}
         if not self.models:
-            return {
-                'linear_regression': 'N/A',
-                'random_forest': 'N/A', 
-                'bayes_theorem': 'N/A',
-                'mlp': 'N/A',
-                'our_model': 'N/A'
-            }
-            
-        predictions = {}
+            for model_name in self.model_classes:
+                predictions[model_name] = 'N/A'
+            return predictions
         
         for model_name, model in self.models.items():
             try:
                 prediction = model.predict(temperature, humidity)
                 predictions[model_name] = prediction
             except Exception as e:
-                print(f"Error predicting with {model_name}: {e}")
+                log.error("Error predicting with %s: %s", model_name, e)
                 predictions[model_name] = 'Error'
                 
         return predictions
     
     def get_voting_decision(self, predictions: dict):
         """Make voting decision based on all model predictions"""
-        if not predictions or all(pred in ['N/A', 'Error'] for pred in predictions.values()):
+        if not predictions:
             return 'N/A'
-            
-        # Count valid predictions
-        valid_predictions = [pred for pred in predictions.values() if pred not in ['N/A', 'Error']]
-        
-        if not valid_predictions:
-            return 'N/A'
-            
-        # Simple majority voting
-        from collections import Counter
-        vote_counts = Counter(valid_predictions)
-        
-        # Return prediction with most votes
-        most_common = vote_counts.most_common(1)
-        if most_common:
-            return most_common[0][0]
-        else:
+
+        # Accumulate accuracy-weighted votes into the fixed three-label
+        # histogram (no Counter object churn; five dict lookups per call).
+        # Models start at weight 1.0 until feedback establishes a track
+        # record, so this degrades to plain majority voting cold-start.
+        counts = [0.0, 0.0, 0.0]
+        total = 0
+        for model_name, pred in predictions.items():
+            code = LABEL_TO_INT.get(pred)
+            if code is not None:
+                counts[code] += self._model_accuracy.get(model_name, 1.0)
+                total += 1
+
+        if total == 0:
             return 'N/A'
+
+        # Weighted majority voting
+        return INT_TO_LABEL[counts.index(max(counts))]
+
+    def record_ground_truth(self, temperature: float, humidity: float, true_label: str):
+        """Update each model's rolling accuracy from a user feedback label
+
+        Exponential moving average keeps the estimate responsive to recent
+        behaviour (a model degrading after a data shift loses weight within
+        a few feedback entries) at one multiply-add per model.
+        """
+        if true_label not in LABEL_TO_INT:
+            return
+
+        alpha = self._accuracy_ema_alpha
+        for model_name, model in self.models.items():
+            try:
+                correct = 1.0 if model.predict(temperature, humidity) == true_label else 0.0
+            except Exception:
+                continue
+            previous = self._model_accuracy.get(model_name, 1.0)
+            self._model_accuracy[model_name] = alpha * correct + (1.0 - alpha) * previous
+
+    def get_voting_decisions_batch(self, preds_matrix) -> np.ndarray:
+        """Hard-vote across models for a whole batch of samples at once
+
+        Args:
+            preds_matrix: (n_models, n_samples) array-like of label strings,
+                one row per model (e.g. stacked predict_batch outputs);
+                'N/A'/'Error' entries are ignored as invalid votes
+
+        Returns:
+            np.ndarray: winning label per sample, 'N/A' where no model
+            produced a valid vote
+        """
+        preds_matrix = np.asarray(preds_matrix)
+
+        # One boolean reduction per class instead of per-sample counting
+        counts = np.stack([(preds_matrix == label).sum(axis=0)
+                           for label in INT_TO_LABEL])
+        winners = INT_TO_LABEL[counts.argmax(axis=0)].copy()
+        winners[counts.sum(axis=0) == 0] = 'N/A'
+        return winners
     
     def get_current_person_type(self):
         """Get current person type"""
@@ -219,12 +383,7 @@ class ModelManager:
     def initialize_default_models(self):
         """Initialize default models (Normal Person)"""
         # Train default person type directly, avoid same type check in switch_person_type
-        training_thread = threading.Thread(
-            target=self._train_models_for_person_type,
-            args=(self.current_person_type,),
-            daemon=True
-        )
-        training_thread.start()
+        self._submit_training(self.current_person_type)
     
     def get_our_model_prediction(self, temperature: float, humidity: float):
         """Get prediction from our custom model"""
@@ -234,5 +393,5 @@ class ModelManager:
         try:
             return self.models['our_model'].predict(temperature, humidity)
         except Exception as e:
-            print(f"Error predicting with our_model: {e}")
+            log.error("Error predicting with our_model: %s", e)
             return 'Error' 
\ No newline at end of file
@@ -7,10 +7,17 @@ import numpy as np
 
 class OurModel(BaseComfortModel):
     """Our custom comfort prediction model"""
-    
+
+    # Default temperature thresholds (°F), used until train() calibrates
+    # per-dataset values
+    HOT_THRESHOLD = 76.6
+    COLD_THRESHOLD = 76.4
+
     def __init__(self):
         super().__init__("our_model")
-    
+        self.hot_threshold = self.HOT_THRESHOLD
+        self.cold_threshold = self.COLD_THRESHOLD
+
     def predict(self, temperature: float, humidity: float) -> str:
         """
         Predict comfort level using our custom algorithm
@@ -23,10 +30,20 @@ class OurModel(BaseComfortModel):
         Returns:
             str: "hot", "comfortable", or "cold"
         """
-        # TODO: Implement our custom prediction logic here
-       
+        if temperature > self.hot_threshold:
+            return "hot"
+        if temperature < self.cold_threshold:
+            return "cold"
         return "comfortable"
-    
+
+    def predict_batch(self, X: np.ndarray) -> np.ndarray:
+        """Vectorized counterpart of predict for an (N, 2) feature matrix"""
+        # Two C-level comparisons over the temperature column classify the
+        # whole batch without a Python-level loop
+        temps = X[:, 0]
+        return np.where(temps > self.hot_threshold, "hot",
+                        np.where(temps < self.cold_threshold, "cold", "comfortable"))
+
     def train(self, X: np.ndarray, y: np.ndarray):
         """
         Train our custom model
@@ -35,6 +52,15 @@ class OurModel(BaseComfortModel):
             X: Feature matrix of shape (n_samples, 2) containing [temperature, humidity]
             y: Target labels of shape (n_samples,) containing comfort labels
         """
-        # TODO: Implement our custom training logic here
+        # Calibrate the thresholds from the class boundaries in the data:
+        # a hot/cold person's labels shift the quantiles, so each person
+        # type gets its own cut points instead of one hardcoded pair
+        t = X[:, 0]
+        hot_t = t[y == 'hot']
+        cold_t = t[y == 'cold']
+        if hot_t.size:
+            self.hot_threshold = float(np.quantile(hot_t, 0.10))
+        if cold_t.size:
+            self.cold_threshold = float(np.quantile(cold_t, 0.90))
         
         self.is_trained = True 
\ No newline at end of file
@@ -6,8 +6,6 @@ Automatically trains and evaluates our custom model on all three person types
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score
 import sys
 import os
 import time
@@ -19,6 +17,8 @@ project_root = current_dir.parent
 sys.path.append(str(project_root))
 
 # Import all available models
+from ml_models.base_model import LABEL_TO_INT, INT_TO_LABEL
+from ml_models.model_manager import load_training_arrays
 from ml_models.our_model import OurModel
 from ml_models.ml_algorithms.linear_regression import LinearRegressionModel
 from ml_models.ml_algorithms.random_forest import RandomForestModel
@@ -50,15 +50,60 @@ def load_person_data(data_dir: Path, person_type: str):
     if not data_file.exists():
         raise FileNotFoundError(f"Data file not found: {data_file}")
     
-    # Read CSV data
-    df = pd.read_csv(data_file)
+    csv_mtime = data_file.stat().st_mtime
     
-    # Separate features and labels
-    X = df[['temperature', 'humidity']].values
-    y = df['comfort_label'].values
+    # Binary sidecar cache: the CSV is parsed once per edit, subsequent
+    # script invocations load packed .npy arrays (memory-mapped features,
+    # int8 label codes) instead of re-running the pandas parser
+    cache_dir = data_dir / ".npy_cache"
+    X_path = cache_dir / f"{person_type}.X.npy"
+    y_path = cache_dir / f"{person_type}.y.npy"
+    if (X_path.exists() and y_path.exists()
+            and X_path.stat().st_mtime >= csv_mtime):
+        return np.load(X_path, mmap_mode='r'), INT_TO_LABEL[np.load(y_path)]
     
+    # Cached parse (shared with ModelManager) keyed on the file's mtime
+    X, y = load_training_arrays(str(data_file), csv_mtime)
+    try:
+        cache_dir.mkdir(exist_ok=True)
+        np.save(X_path, X)
+        np.save(y_path, np.searchsorted(INT_TO_LABEL,
+                                        y.astype('U11')).astype(np.int8))
+    except OSError:
+        pass  # cache is an optimization; a read-only data dir is fine
     return X, y
 
+def stratified_split(X, y, test_frac: float = 0.2, seed: int = 42):
+    """Stratified train/test split via per-class index shuffles
+
+    Same per-class balance guarantee as sklearn's train_test_split with
+    stratify=y, but with plain NumPy indexing: one shuffle and one fancy-
+    index per class, no sklearn bookkeeping objects.
+    """
+    rng = np.random.default_rng(seed)
+    train_idx = []
+    test_idx = []
+    for c in np.unique(y):
+        idx = np.flatnonzero(y == c)
+        rng.shuffle(idx)
+        k = int(len(idx) * test_frac)
+        test_idx.append(idx[:k])
+        train_idx.append(idx[k:])
+    tr = np.concatenate(train_idx)
+    ti = np.concatenate(test_idx)
+    return X[tr], X[ti], y[tr], y[ti]
+
+def score_thresholds(t, y_codes, hot: float, cold: float) -> int:
+    """Count correct threshold predictions without materializing labels
+
+    Fused predict-and-score for thresholded models: classify the
+    temperature column to int8 codes and compare against the encoded
+    ground truth in the same pass, so no string prediction array is built.
+    """
+    codes = np.where(t > hot, np.int8(2),
+                     np.where(t < cold, np.int8(0), np.int8(1)))
+    return int(np.count_nonzero(codes == y_codes))
+
 def print_model_parameters(model, algorithm_type: str, X_train, y_train):
     """Print algorithm-specific parameters after training"""
     print(f"Algorithm Parameters ({algorithm_type}):")
@@ -71,10 +116,10 @@ def print_model_parameters(model, algorithm_type: str, X_train, y_train):
             print(f"  Intercept: {model.model.intercept_:.3f}")
             
             # Calculate R² score if possible
-            if hasattr(model, 'label_encoder'):
-                y_encoded = model.label_encoder.transform(y_train)
-                r2_score = model.model.score(X_train, y_encoded)
-                print(f"  R² Score: {r2_score:.3f}")
+            y_encoded = np.fromiter((LABEL_TO_INT[label] for label in y_train),
+                                    dtype=np.int8, count=len(y_train))
+            r2_score = model.model.score(X_train, y_encoded)
+            print(f"  R² Score: {r2_score:.3f}")
         else:
             print("  Linear regression parameters not available")
         
@@ -82,15 +127,9 @@ def print_model_parameters(model, algorithm_type: str, X_train, y_train):
         # Bayes parameters
         if hasattr(model, 'model') and hasattr(model.model, 'class_prior_'):
             print("  Class prior probabilities:")
-            if hasattr(model, 'label_encoder'):
-                class_priors = dict(zip(
-                    model.label_encoder.inverse_transform(range(len(model.model.class_prior_))),
-                    model.model.class_prior_
-                ))
-                for class_name, prior in class_priors.items():
-                    print(f"    {class_name}: {prior:.3f}")
-            else:
-                print("    Prior probabilities available but label encoder not found")
+            class_priors = dict(zip(INT_TO_LABEL, model.model.class_prior_))
+            for class_name, prior in class_priors.items():
+                print(f"    {class_name}: {prior:.3f}")
         else:
             print("  Bayes parameters not available")
             
@@ -112,22 +151,23 @@ def print_model_parameters(model, algorithm_type: str, X_train, y_train):
             print(f"  Iterations completed: {getattr(model.model, 'n_iter_', 'Unknown')}")
             
             # Calculate training accuracy if possible
-            if hasattr(model, 'scaler') and hasattr(model, 'label_encoder'):
+            if hasattr(model, 'scaler'):
                 X_scaled = model.scaler.transform(X_train)
-                y_encoded = model.label_encoder.transform(y_train)
+                y_encoded = np.fromiter((LABEL_TO_INT[label] for label in y_train),
+                                        dtype=np.int8, count=len(y_train))
                 training_accuracy = model.model.score(X_scaled, y_encoded)
                 print(f"  Training accuracy: {training_accuracy:.3f}")
         else:
             print("  MLP parameters not available")
     
     elif algorithm_type == "our_model":
-        # Our custom algorithm parameters
+        # Our custom algorithm parameters (calibrated during train)
         print(f"  Custom algorithm logic: Temperature thresholds")
-        print(f"  Hot threshold: > 76.6°F")
-        print(f"  Cold threshold: < 76.4°F")
-        print(f"  Comfortable range: 76.4°F - 76.6°F")
+        print(f"  Hot threshold: > {model.hot_threshold:.1f}°F")
+        print(f"  Cold threshold: < {model.cold_threshold:.1f}°F")
+        print(f"  Comfortable range: {model.cold_threshold:.1f}°F - {model.hot_threshold:.1f}°F")
 
-def evaluate_model_on_dataset(X_train, X_test, y_train, y_test, person_type: str, algorithm_type: str = "our_model"):
+def evaluate_model_on_dataset(X_train, X_test, y_train, y_test, person_type: str, algorithm_type: str = "our_model", verbose: bool = True):
     """Train and evaluate our model on a specific dataset"""
     print(f"\n{'='*50}")
     print(f"Training and Evaluating: {person_type.upper()}")
@@ -148,24 +188,31 @@ def evaluate_model_on_dataset(X_train, X_test, y_train, y_test, person_type: str
     
     print(f"Training completed in {training_time:.4f} seconds")
     
-    # Print model-specific parameters
-    print_model_parameters(model, algorithm_type, X_train, y_train)
+    # Print model-specific parameters (the R²/accuracy diagnostics re-score
+    # the full training set, so skip them in non-verbose runs)
+    if verbose:
+        print_model_parameters(model, algorithm_type, X_train, y_train)
     
     print("-" * 30)
     
-    # Make predictions on test set
-    y_pred = []
-    for i in range(len(X_test)):
-        # All algorithms use the same temperature unit (Fahrenheit from CSV)
-        temperature = X_test[i][0]
-        humidity = X_test[i][1]
-        prediction = model.predict(temperature, humidity)
-        y_pred.append(prediction)
-    
-    y_pred = np.array(y_pred)
-    
-    # Calculate simple metrics
-    correct = sum(y_test == y_pred)
+    # Encode ground truth to int8 codes once (INT_TO_LABEL is
+    # lexicographically ordered, so searchsorted is an exact encoder)
+    y_test_codes = np.searchsorted(INT_TO_LABEL, y_test).astype(np.int8)
+
+    if algorithm_type == "our_model":
+        # Thresholded model: fuse predict + compare + count over the
+        # temperature column, skipping the predictions array entirely
+        correct = score_thresholds(X_test[:, 0], y_test_codes,
+                                   model.hot_threshold, model.cold_threshold)
+    else:
+        # Make predictions on the whole test set in one batched call
+        # (all algorithms use the same temperature unit - Fahrenheit from CSV)
+        y_pred = model.predict_batch(X_test)
+
+        # Compare packed int8 codes instead of summing per-element string
+        # comparisons in Python
+        y_pred_codes = np.searchsorted(INT_TO_LABEL, y_pred).astype(np.int8)
+        correct = int(np.count_nonzero(y_test_codes == y_pred_codes))
     incorrect = len(y_test) - correct
     accuracy = correct / len(y_test)
     
@@ -202,6 +249,11 @@ Example usage:
         choices=["our_model", "linear", "bayes", "forest", "mlp"],
         help='Algorithm type to train and evaluate'
     )
+    parser.add_argument(
+        '--quiet',
+        action='store_true',
+        help='Skip the per-model parameter printouts (avoids re-scoring the training set)'
+    )
     
     args = parser.parse_args()
     algorithm_type = args.algorithm_type
@@ -226,16 +278,15 @@ Example usage:
             # Load data
             X, y = load_person_data(data_dir, person_type)
             
-            # Split into train/test sets (80/20 split)
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y, 
-                test_size=0.2, 
-                random_state=42, 
-                stratify=y  # Ensure balanced splits across classes
+            # Split into train/test sets (80/20 split, stratified so
+            # class balance is preserved)
+            X_train, X_test, y_train, y_test = stratified_split(
+                X, y, test_frac=0.2, seed=42
             )
             
             # Train and evaluate using specified model type
-            accuracy = evaluate_model_on_dataset(X_train, X_test, y_train, y_test, person_type, algorithm_type)
+            accuracy = evaluate_model_on_dataset(X_train, X_test, y_train, y_test, person_type, algorithm_type,
+                                                 verbose=not args.quiet)
             results[person_type] = accuracy
             
         except Exception as e:
@@ -247,15 +298,22 @@ Example usage:
     print("📊 SUMMARY RESULTS")
     print(f"{'='*60}")
     
+    # Single pass over the results: build all summary lines into one
+    # buffer and accumulate the average as we go, then write once
+    lines = []
+    valid_total = 0.0
+    valid_count = 0
     for person_type, accuracy in results.items():
         status = "✅" if accuracy > 0 else "❌"
-        print(f"{status} {person_type.replace('_', ' ').title():>15}: {accuracy:.3f} ({accuracy*100:.1f}%)")
+        lines.append(f"{status} {person_type.replace('_', ' ').title():>15}: {accuracy:.3f} ({accuracy*100:.1f}%)")
+        if accuracy > 0:
+            valid_total += accuracy
+            valid_count += 1
     
-    # Calculate and print average accuracy
-    valid_accuracies = [acc for acc in results.values() if acc > 0]
-    if valid_accuracies:
-        avg_accuracy = sum(valid_accuracies) / len(valid_accuracies)
-        print(f"\n🎯 Average Accuracy: {avg_accuracy:.3f} ({avg_accuracy*100:.1f}%)")
+    if valid_count:
+        avg_accuracy = valid_total / valid_count
+        lines.append(f"\n🎯 Average Accuracy: {avg_accuracy:.3f} ({avg_accuracy*100:.1f}%)")
+    print("\n".join(lines))
     
     print(f"\n{'='*60}")
     print("Training and evaluation completed!")